@@ -0,0 +1,200 @@
+# src/batch.py
+
+import sys
+import os
+import json
+import time
+import argparse
+import traceback
+import multiprocessing
+from contextlib import redirect_stdout, redirect_stderr
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+
+# Only the standard library is imported here: the pipeline modules bind their settings at
+# import time, so they are imported in each worker after the project's settings are applied.
+from config import settings
+
+DEFAULT_WORKERS = max(1, min(4, os.cpu_count() or 1))
+# Google Sheets allows 60 requests per minute per user; the quota is shared by all projects
+DEFAULT_SHEETS_REQUESTS_PER_MINUTE = 60
+
+# Local state that must not be shared between projects: one subdirectory (or file) per project
+PROJECT_STATE_DIRS = ["REPORT_OUTPUT_DIR", "CHECKPOINT_DIR", "CHANGE_LOG_DIR", "STATUS_HISTORY_DIR", "EMAIL_DRY_RUN_DIR"]
+PROJECT_STATE_FILES = ["DUPLICATE_INDEX_PATH", "JIRA_LAST_RUN_PATH"]
+
+class SharedRateLimiter:
+    """
+    Spaces requests evenly across processes, so that all projects together stay under one quota.
+
+    The next free request slot lives in a manager process; acquire() reserves a slot under
+    the shared lock and sleeps outside of it until the slot comes.
+    """
+
+    def __init__(self, manager, requests_per_minute=DEFAULT_SHEETS_REQUESTS_PER_MINUTE):
+        self.interval = 60.0 / requests_per_minute
+        self._lock = manager.Lock()
+        self._next_slot = manager.Value("d", 0.0)
+
+    def acquire(self):
+        with self._lock:
+            slot = max(time.time(), self._next_slot.value)
+            self._next_slot.value = slot + self.interval
+        delay = slot - time.time()
+        if delay > 0:
+            time.sleep(delay)
+
+def load_projects(path):
+    """
+    Read the project list of a batch run.
+
+    The file is a JSON list of {"name": ..., "settings": {...}} objects, where settings
+    overrides config.settings for that project (Jira export or JQL, spreadsheet IDs, recipients...).
+
+    Parameters:
+        path (str): Path of the JSON projects file.
+
+    Returns:
+        list: The project configs.
+    """
+    with open(path, "r") as f:
+        projects = json.load(f)
+
+    names = [project.get("name") for project in projects]
+    if not all(names):
+        raise ValueError(f"Every project in {path} needs a name")
+    duplicated = sorted({name for name in names if names.count(name) > 1})
+    if duplicated:
+        raise ValueError(f"Duplicate project names in {path}: {', '.join(duplicated)}")
+    for project in projects:
+        unknown_keys = sorted(key for key in project.get("settings", {}) if not hasattr(settings, key))
+        if unknown_keys:
+            raise ValueError(f"Unknown settings for project {project['name']}: {', '.join(unknown_keys)}")
+    return projects
+
+def project_settings(project):
+    """
+    The settings overrides of a project, with its local state moved to per-project paths
+    unless the project sets them explicitly.
+    """
+    overrides = {}
+    for key in PROJECT_STATE_DIRS:
+        base_dir = getattr(settings, key, None)
+        if base_dir:
+            overrides[key] = os.path.join(base_dir, project["name"])
+    for key in PROJECT_STATE_FILES:
+        base_path = getattr(settings, key, None)
+        if base_path:
+            overrides[key] = os.path.join(os.path.dirname(base_path), project["name"], os.path.basename(base_path))
+    overrides.update(project.get("settings", {}))
+    return overrides
+
+def run_project(project, rate_limiter, log_dir, fresh=False):
+    """
+    Run the pipeline for one project. Executed in a fresh worker process.
+
+    Parameters:
+        project (dict): The project config.
+        rate_limiter (SharedRateLimiter): Limiter shared by all workers for the Google Sheets API.
+        log_dir (str): Directory of the per-project logs.
+        fresh (bool): Ignore the checkpoint of an unfinished run.
+
+    Returns:
+        dict: The outcome of the run (status, duration, run id, number of change events, error).
+    """
+    for key, value in project_settings(project).items():
+        setattr(settings, key, value)
+
+    result = {"project": project["name"], "status": "failed", "started_at": datetime.now().isoformat(timespec="seconds"),
+              "duration_seconds": None, "run_id": None, "change_events": None, "error": None,
+              "log": os.path.join(log_dir, f"{project['name']}.log")}
+    started = time.monotonic()
+    with open(result["log"], "w") as log, redirect_stdout(log), redirect_stderr(log):
+        try:
+            from src import main as pipeline
+            from src.google_sheets import set_rate_limiter
+            from src.change_log import read_events
+
+            set_rate_limiter(rate_limiter)
+            result["run_id"] = pipeline.main(fresh=fresh)
+            result["change_events"] = len(read_events(run_ids=[result["run_id"]]))
+            result["status"] = "succeeded"
+        except Exception as e:
+            result["error"] = f"{type(e).__name__}: {e}"
+            traceback.print_exc()
+    result["duration_seconds"] = round(time.monotonic() - started, 3)
+    return result
+
+def run_batch(projects, workers=DEFAULT_WORKERS, requests_per_minute=DEFAULT_SHEETS_REQUESTS_PER_MINUTE, fresh=False):
+    """
+    Run the pipeline for several projects in parallel and write a consolidated run report.
+
+    Each project runs in its own process (so pandas work runs on all cores and every project
+    gets its own settings and module state), while all Google Sheets requests go through
+    one shared rate limiter.
+
+    Parameters:
+        projects (list): Project configs (see load_projects).
+        workers (int): Number of projects run at the same time.
+        requests_per_minute (int): Google Sheets requests per minute, for all projects together.
+        fresh (bool): Ignore the checkpoints of unfinished runs.
+
+    Returns:
+        dict: The run report.
+    """
+    started_at = datetime.now()
+    batch_id = started_at.strftime("%Y%m%d-%H%M%S")
+    report_dir = os.path.join(settings.REPORT_OUTPUT_DIR, "batches")
+    log_dir = os.path.join(report_dir, f"batch-{batch_id}")
+    os.makedirs(log_dir, exist_ok=True)
+    print(f"Batch {batch_id}: running {len(projects)} projects with {workers} workers ({requests_per_minute} Sheets requests/minute)")
+
+    results = []
+    # Spawned single-use workers: every project starts from a clean interpreter with its own settings
+    context = multiprocessing.get_context("spawn")
+    with context.Manager() as manager:
+        rate_limiter = SharedRateLimiter(manager, requests_per_minute)
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context, max_tasks_per_child=1) as executor:
+            futures = {executor.submit(run_project, project, rate_limiter, log_dir, fresh): project for project in projects}
+            for future in as_completed(futures):
+                project = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    # The worker itself died (e.g. killed); the project's log may be incomplete
+                    result = {"project": project["name"], "status": "failed", "started_at": None, "duration_seconds": None,
+                              "run_id": None, "change_events": None, "error": f"{type(e).__name__}: {e}",
+                              "log": os.path.join(log_dir, f"{project['name']}.log")}
+                results.append(result)
+                print(f"\t{result['project']}: {result['status']} in {result['duration_seconds']}s" + (f" ({result['error']})" if result["error"] else ""))
+
+    order = {project["name"]: position for position, project in enumerate(projects)}
+    results.sort(key=lambda result: order[result["project"]])
+    report = {
+        "batch_id": batch_id,
+        "started_at": started_at.isoformat(timespec="seconds"),
+        "duration_seconds": round((datetime.now() - started_at).total_seconds(), 3),
+        "workers": workers,
+        "sheets_requests_per_minute": requests_per_minute,
+        "succeeded": sum(result["status"] == "succeeded" for result in results),
+        "failed": sum(result["status"] != "succeeded" for result in results),
+        "projects": results
+    }
+    report_path = os.path.join(report_dir, f"batch-{batch_id}.json")
+    with open(report_path, "w") as f:
+        json.dump(report, f, indent=2)
+    print(f"Batch {batch_id}: {report['succeeded']} succeeded, {report['failed']} failed in {report['duration_seconds']}s. Report: {report_path}")
+    return report
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Run the backlog pipeline for several projects in parallel.")
+    parser.add_argument("projects", help="JSON file listing the projects and their settings overrides")
+    parser.add_argument("--workers", type=int, default=DEFAULT_WORKERS, help="number of projects run at the same time")
+    parser.add_argument("--sheets-requests-per-minute", type=int, default=DEFAULT_SHEETS_REQUESTS_PER_MINUTE, help="Google Sheets request budget shared by all projects")
+    parser.add_argument("--fresh", action="store_true", help="ignore the checkpoints of unfinished runs")
+    return parser.parse_args()
+
+if __name__ == "__main__":
+    args = parse_args()
+    report = run_batch(load_projects(args.projects), workers=args.workers, requests_per_minute=args.sheets_requests_per_minute, fresh=args.fresh)
+    sys.exit(1 if report["failed"] else 0)
@@ -0,0 +1,165 @@
+# src/change_log.py
+
+import os
+import json
+import glob
+import threading
+from contextlib import contextmanager
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+from config.settings import CHANGE_LOG_DIR
+from src.google_sheets import add_write_listener
+
+EVENT_COLUMNS = ["run_id", "step", "ticket", "field", "old", "new", "recorded_at"]
+
+_run_id = None
+_current_step = None
+# Events waiting for the write of their sheet: (spreadsheet_id, sheet_name) -> events
+_pending_events = {}
+_lock = threading.Lock()
+
+def start_run(run_id):
+    """
+    Set the run id attached to every event emitted from now on.
+    """
+    global _run_id
+    _run_id = run_id
+
+def _jsonable(value):
+    if value is None or value is pd.NA or value is pd.NaT:
+        return None
+    if isinstance(value, np.generic):
+        value = value.item()
+    if isinstance(value, float) and not np.isfinite(value):
+        return None
+    if isinstance(value, (str, int, float, bool)):
+        return value
+    return str(value)
+
+def emit_changes(field, tickets, old_values, new_values, sheet=None):
+    """
+    Record a change event for every ticket whose value of field went from old to new.
+
+    The events are appended to the log once the sheet holding the change is written,
+    so that a step failing before that write leaves no events behind.
+
+    Parameters:
+        field (str): The changed field, e.g. "Status" or "Plugins(All).Status" for a Key Issues sheet.
+        tickets (iterable): Ticket ids.
+        old_values (iterable): Values before the change (None for inserts).
+        new_values (iterable): Values after the change (None for removals).
+        sheet (tuple): (spreadsheet_id, sheet_name) of the sheet the change is written to;
+            None appends the events to the log straight away.
+
+    Returns:
+        int: Number of events recorded.
+    """
+    recorded_at = datetime.now().isoformat(timespec="seconds")
+    events = [
+        {"run_id": _run_id, "step": _current_step, "ticket": _jsonable(ticket), "field": field,
+         "old": _jsonable(old), "new": _jsonable(new), "recorded_at": recorded_at}
+        for ticket, old, new in zip(tickets, old_values, new_values)
+    ]
+    if sheet is None:
+        _append_events(events)
+    else:
+        with _lock:
+            _pending_events.setdefault(sheet, []).extend(events)
+    return len(events)
+
+def emit_inserts(spreadsheet_id, sheet_name, tickets):
+    """
+    Record that tickets were added to a sheet.
+    """
+    tickets = list(tickets)
+    return emit_changes(f"{sheet_name}.listed", tickets, [False] * len(tickets), [True] * len(tickets), sheet=(spreadsheet_id, sheet_name))
+
+def emit_removals(spreadsheet_id, sheet_name, tickets):
+    """
+    Record that tickets were removed from a sheet.
+    """
+    tickets = list(tickets)
+    return emit_changes(f"{sheet_name}.listed", tickets, [True] * len(tickets), [False] * len(tickets), sheet=(spreadsheet_id, sheet_name))
+
+def _segment_path(run_id, log_dir=CHANGE_LOG_DIR):
+    return os.path.join(log_dir, f"events-{run_id or 'manual'}.jsonl")
+
+def _append_events(events, log_dir=CHANGE_LOG_DIR):
+    """
+    Append events to the run's JSONL segment.
+    """
+    if not events:
+        return
+    os.makedirs(log_dir, exist_ok=True)
+    with open(_segment_path(_run_id, log_dir), "a") as f:
+        f.write("".join(json.dumps(event) + "\n" for event in events))
+
+def _log_written_sheet(write):
+    # Write listener: the changes of this sheet have landed, so its pending events are logged.
+    # Only the sheet identity is used, so no read-back frame or modification time is computed for it.
+    with _lock:
+        events = _pending_events.pop((write.spreadsheet_id, write.sheet_name), [])
+    _append_events(events)
+
+add_write_listener(_log_written_sheet)
+
+def discard():
+    """
+    Drop the pending events, whose sheets were not written (so the changes never happened).
+
+    Returns:
+        int: Number of events dropped.
+    """
+    with _lock:
+        dropped = sum(len(events) for events in _pending_events.values())
+        _pending_events.clear()
+    return dropped
+
+@contextmanager
+def step(step_name):
+    """
+    Attribute the events emitted inside the block to step_name. Events of sheets the step
+    did not write (e.g. because it failed before the write) are dropped when it ends.
+    """
+    global _current_step
+    _current_step = step_name
+    try:
+        yield
+    finally:
+        _current_step = None
+        dropped = discard()
+        if dropped:
+            print(f"\tDropped {dropped} change events of {step_name}: their sheets were not written.")
+
+def read_events(run_ids=None, since_run=None, fields=None, log_dir=CHANGE_LOG_DIR):
+    """
+    Read change events back from the log.
+
+    Parameters:
+        run_ids (list): Only these runs (all runs if None).
+        since_run (str): Only runs after this run id (run ids sort chronologically).
+        fields (list): Only these fields.
+        log_dir (str): The change log directory.
+
+    Returns:
+        pd.DataFrame: The events with EVENT_COLUMNS, in the order they were recorded.
+    """
+    paths = sorted(glob.glob(os.path.join(log_dir, "events-*.jsonl")))
+    selected_paths = []
+    for path in paths:
+        run_id = os.path.basename(path)[len("events-"):-len(".jsonl")]
+        if run_ids is not None and run_id not in run_ids:
+            continue
+        if since_run is not None and run_id <= since_run:
+            continue
+        selected_paths.append(path)
+
+    frames = [pd.read_json(path, lines=True, dtype=False) for path in selected_paths if os.path.getsize(path) > 0]
+    if not frames:
+        return pd.DataFrame(columns=EVENT_COLUMNS)
+    events_df = pd.concat(frames, ignore_index=True)[EVENT_COLUMNS]
+    if fields is not None:
+        events_df = events_df[events_df["field"].isin(fields)].reset_index(drop=True)
+    return events_df
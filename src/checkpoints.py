@@ -0,0 +1,170 @@
+# src/checkpoints.py
+
+import os
+import re
+import json
+import shutil
+from contextlib import contextmanager
+from datetime import datetime, timedelta
+
+import pandas as pd
+from config.settings import CHECKPOINT_DIR, JIRA_SOURCE, JIRA_CSV_PATH
+from src.google_sheets import add_write_listener, remove_write_listener, preload_sheet
+from src.fetch_jira import get_jira_state, restore_jira_state
+
+MANIFEST_FILE = "manifest.json"
+JIRA_FRAME_FILE = "jira_issues.pkl"
+# An unfinished run older than this is not resumed: the sheets have likely moved on since
+CHECKPOINT_MAX_AGE = timedelta(hours=12)
+
+def jira_source_signature():
+    """
+    Identify the Jira input of a run: the export's modification time and size, or "api".
+    """
+    if JIRA_SOURCE == "api":
+        return "api"
+    if not os.path.exists(JIRA_CSV_PATH):
+        return None
+    stat = os.stat(JIRA_CSV_PATH)
+    return [stat.st_mtime, stat.st_size]
+
+def _frame_file_name(position, step_name, spreadsheet_id, sheet_name):
+    safe_sheet = re.sub(r"[^A-Za-z0-9]+", "_", f"{spreadsheet_id}_{sheet_name}").strip("_")
+    return f"{position:02d}_{step_name}_{safe_sheet}.pkl"
+
+class RunCheckpoint:
+    """
+    Per-step checkpoints of a pipeline run.
+
+    Every sheet written by a step is saved next to a JSON manifest once the step completed,
+    together with the spreadsheet's modification time after the write. A rerun after a failure
+    skips the completed steps and serves their sheets from memory instead of downloading them
+    again, as long as the spreadsheet has not been modified since the run last wrote to it
+    (e.g. by a manual edit).
+
+    Frames are stored as pickles rather than Parquet: sheet columns routinely mix numbers
+    and strings ("N/A", ""), which pickles round-trip exactly.
+    """
+
+    def __init__(self, directory, manifest):
+        self.directory = directory
+        self.manifest = manifest
+
+    @property
+    def run_id(self):
+        return self.manifest["run_id"]
+
+    @classmethod
+    def start_or_resume(cls, directory=CHECKPOINT_DIR, fresh=False):
+        """
+        Resume the unfinished run in directory, or start a new one.
+
+        A run is resumed only if it did not complete, is younger than CHECKPOINT_MAX_AGE
+        and used the same Jira input; fresh=True always starts a new run.
+
+        Returns:
+            RunCheckpoint: The checkpoint of the current run.
+        """
+        manifest_path = os.path.join(directory, MANIFEST_FILE)
+        if not fresh and os.path.exists(manifest_path):
+            with open(manifest_path, "r") as f:
+                manifest = json.load(f)
+            age = datetime.now() - datetime.fromisoformat(manifest["started_at"])
+            if manifest["status"] != "completed" and age < CHECKPOINT_MAX_AGE and manifest["jira_source"] == jira_source_signature():
+                checkpoint = cls(directory, manifest)
+                checkpoint.restore()
+                return checkpoint
+
+        shutil.rmtree(directory, ignore_errors=True)
+        os.makedirs(directory, exist_ok=True)
+        started_at = datetime.now()
+        checkpoint = cls(directory, {
+            "run_id": started_at.strftime("%Y%m%d-%H%M%S"),
+            "started_at": started_at.isoformat(),
+            "status": "running",
+            "jira_source": jira_source_signature(),
+            "jira_fetch_started_at": None,
+            "steps": {}
+        })
+        checkpoint._save_manifest()
+        return checkpoint
+
+    def is_completed(self, step_name):
+        return step_name in self.manifest["steps"]
+
+    def _save_manifest(self):
+        manifest_path = os.path.join(self.directory, MANIFEST_FILE)
+        tmp_path = f"{manifest_path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump(self.manifest, f, indent=2)
+        os.replace(tmp_path, manifest_path)
+
+    def restore(self):
+        """
+        Load the checkpointed state: the latest written frame of every sheet and the fetched Jira issues.
+        """
+        latest_frames = {}
+        latest_modified_times = {}
+        for step in self.manifest["steps"].values():
+            for sheet in step["sheets"]:
+                latest_frames[(sheet["spreadsheet_id"], sheet["sheet_name"])] = sheet["file"]
+                latest_modified_times[sheet["spreadsheet_id"]] = sheet.get("modified_time")
+
+        restored_count = 0
+        for (spreadsheet_id, sheet_name), file_name in latest_frames.items():
+            # An append leaves no frame: that sheet is read again from Google Sheets.
+            # The modification time is per spreadsheet, so a frame is checked (on read) against the
+            # last write of the run to its spreadsheet: any later change means an edit from outside.
+            modified_time = latest_modified_times[spreadsheet_id]
+            if file_name is not None and modified_time is not None:
+                preload_sheet(spreadsheet_id, sheet_name, pd.read_pickle(os.path.join(self.directory, file_name)), modified_time)
+                restored_count += 1
+
+        jira_path = os.path.join(self.directory, JIRA_FRAME_FILE)
+        if os.path.exists(jira_path) and self.manifest["jira_fetch_started_at"]:
+            restore_jira_state(pd.read_pickle(jira_path), datetime.fromisoformat(self.manifest["jira_fetch_started_at"]))
+
+        completed = ", ".join(self.manifest["steps"]) or "none"
+        print(f"Resuming run {self.run_id} (completed steps: {completed}; {restored_count} sheets restored from checkpoint if unchanged)")
+
+    @contextmanager
+    def step(self, step_name):
+        """
+        Run a step, then checkpoint every sheet it wrote and mark it completed.
+        Nothing is recorded if the step raises.
+        """
+        written = {}
+
+        def record_write(write):
+            written[(write.spreadsheet_id, write.sheet_name)] = (write.df, write.modified_time)
+
+        add_write_listener(record_write)
+        try:
+            yield
+        finally:
+            remove_write_listener(record_write)
+
+        position = len(self.manifest["steps"]) + 1
+        sheets = []
+        for (spreadsheet_id, sheet_name), (df, modified_time) in written.items():
+            file_name = None
+            if df is not None:
+                file_name = _frame_file_name(position, step_name, spreadsheet_id, sheet_name)
+                df.to_pickle(os.path.join(self.directory, file_name))
+            sheets.append({"spreadsheet_id": spreadsheet_id, "sheet_name": sheet_name, "file": file_name, "modified_time": modified_time})
+
+        jira_df, fetch_started_at = get_jira_state()
+        if jira_df is not None and self.manifest["jira_fetch_started_at"] is None:
+            jira_df.to_pickle(os.path.join(self.directory, JIRA_FRAME_FILE))
+            self.manifest["jira_fetch_started_at"] = fetch_started_at.isoformat()
+
+        self.manifest["steps"][step_name] = {"completed_at": datetime.now().isoformat(), "sheets": sheets}
+        self._save_manifest()
+
+    def finish(self):
+        """
+        Mark the run completed, so the next run starts from scratch.
+        """
+        self.manifest["status"] = "completed"
+        self.manifest["completed_at"] = datetime.now().isoformat()
+        self._save_manifest()
@@ -0,0 +1,187 @@
+# src/daemon.py
+
+import os
+import json
+import time
+import threading
+import traceback
+from datetime import datetime
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+from config.settings import JIRA_SOURCE, JIRA_CSV_PATH
+
+DEFAULT_POLL_INTERVAL = 2          # seconds between checks of the Jira export file
+DEFAULT_API_POLL_INTERVAL = 300    # seconds between incremental Jira API fetches
+DEFAULT_SHEET_CACHE_TTL = 900      # seconds a sheet is served from memory before it is downloaded again
+DEFAULT_HEALTH_PORT = 8765
+
+class PipelineMetrics:
+    """
+    Run counters and timings of the daemon, shared with the health endpoint.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.started_at = datetime.now()
+        self.runs_total = 0
+        self.runs_failed = 0
+        self.running = False
+        self.last_run_started_at = None
+        self.last_success_at = None
+        self.last_duration_seconds = None
+        self.last_error = None
+
+    def run_started(self):
+        with self._lock:
+            self.running = True
+            self.last_run_started_at = datetime.now()
+
+    def run_finished(self, duration_seconds, error=None):
+        with self._lock:
+            self.running = False
+            self.runs_total += 1
+            self.last_duration_seconds = duration_seconds
+            if error is None:
+                self.last_success_at = datetime.now()
+                self.last_error = None
+            else:
+                self.runs_failed += 1
+                self.last_error = f"{type(error).__name__}: {error}"
+
+    def health(self):
+        """
+        Health summary: 'ok' unless the last run failed.
+        """
+        with self._lock:
+            return {
+                "status": "error" if self.last_error else "ok",
+                "running": self.running,
+                "started_at": self.started_at.isoformat(),
+                "last_run_started_at": self.last_run_started_at.isoformat() if self.last_run_started_at else None,
+                "last_success_at": self.last_success_at.isoformat() if self.last_success_at else None,
+                "last_error": self.last_error
+            }
+
+    def prometheus(self):
+        """
+        Metrics in the Prometheus text exposition format.
+        """
+        with self._lock:
+            lines = [
+                f"backlog_updater_runs_total {self.runs_total}",
+                f"backlog_updater_runs_failed_total {self.runs_failed}",
+                f"backlog_updater_running {int(self.running)}",
+                f"backlog_updater_uptime_seconds {(datetime.now() - self.started_at).total_seconds():.0f}"
+            ]
+            if self.last_duration_seconds is not None:
+                lines.append(f"backlog_updater_last_run_duration_seconds {self.last_duration_seconds:.3f}")
+            if self.last_success_at is not None:
+                lines.append(f"backlog_updater_last_success_timestamp_seconds {self.last_success_at.timestamp():.0f}")
+        return "\n".join(lines) + "\n"
+
+def start_health_server(metrics, port=DEFAULT_HEALTH_PORT, host="127.0.0.1"):
+    """
+    Serve /health (JSON) and /metrics (Prometheus text) on a background thread.
+
+    Returns:
+        ThreadingHTTPServer: The running server (call shutdown() to stop it).
+    """
+    class HealthHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path == "/health":
+                health = metrics.health()
+                body = json.dumps(health).encode("utf-8")
+                status, content_type = (200 if health["status"] == "ok" else 503), "application/json"
+            elif self.path == "/metrics":
+                body = metrics.prometheus().encode("utf-8")
+                status, content_type = 200, "text/plain; version=0.0.4"
+            else:
+                body, status, content_type = b"Not found\n", 404, "text/plain"
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer((host, port), HealthHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+def export_signature(path=JIRA_CSV_PATH):
+    """
+    (modification time, size) of the Jira export, or None if it does not exist.
+    """
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_mtime, stat.st_size)
+
+def run_once(run_pipeline, metrics):
+    """
+    Run the pipeline once, recording the outcome in the metrics. Errors are reported, not raised.
+    """
+    # Imported here so that loading this module (e.g. for the CLI defaults) stays free of pandas
+    from src.google_sheets import clear_sheet_cache
+    from src.fetch_jira import reset_jira_cache
+
+    reset_jira_cache()
+    metrics.run_started()
+    started = time.monotonic()
+    try:
+        run_pipeline()
+        metrics.run_finished(time.monotonic() - started)
+    except Exception as e:
+        metrics.run_finished(time.monotonic() - started, error=e)
+        # A failed run may have left the sheets half written; download them again next time
+        clear_sheet_cache()
+        print(f"Error: pipeline run failed: {e}")
+        traceback.print_exc()
+
+def run_daemon(run_pipeline, poll_interval=DEFAULT_POLL_INTERVAL, api_poll_interval=DEFAULT_API_POLL_INTERVAL,
+               sheet_cache_ttl=DEFAULT_SHEET_CACHE_TTL, health_port=DEFAULT_HEALTH_PORT):
+    """
+    Keep the process running and apply every new Jira export (or API update) as it arrives.
+
+    The Google Sheets client, worksheet handles and sheet contents stay warm in memory
+    between runs, so a run only pays for the changes instead of a full cold start.
+
+    Parameters:
+        run_pipeline (callable): Runs the pipeline once.
+        poll_interval (int): Seconds between checks of the Jira export file.
+        api_poll_interval (int): Seconds between runs when JIRA_SOURCE is "api".
+        sheet_cache_ttl (int): Seconds a sheet is served from memory before it is downloaded again.
+        health_port (int): Local port of the /health and /metrics endpoint.
+    """
+    from src.google_sheets import enable_sheet_cache
+
+    enable_sheet_cache(sheet_cache_ttl)
+    metrics = PipelineMetrics()
+    server = start_health_server(metrics, port=health_port)
+    print(f"Watching for Jira updates ({'API' if JIRA_SOURCE == 'api' else JIRA_CSV_PATH}). Health endpoint: http://127.0.0.1:{health_port}/health")
+
+    processed_signature = None
+    previous_signature = export_signature()
+    next_api_run = time.monotonic()
+    try:
+        while True:
+            if JIRA_SOURCE == "api":
+                if time.monotonic() >= next_api_run:
+                    next_api_run = time.monotonic() + api_poll_interval
+                    run_once(run_pipeline, metrics)
+            else:
+                signature = export_signature()
+                # Only pick the export up once it stopped changing between two polls (fully written)
+                if signature is not None and signature == previous_signature and signature != processed_signature:
+                    processed_signature = signature
+                    print(f"New Jira export detected at {datetime.now().strftime('%H:%M:%S')}")
+                    run_once(run_pipeline, metrics)
+                previous_signature = signature
+            time.sleep(poll_interval)
+    except KeyboardInterrupt:
+        print("Stopping the watcher.")
+    finally:
+        server.shutdown()
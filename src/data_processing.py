@@ -1,19 +1,18 @@
 # src/data_processing.py
 
-import sys
-import os
-import re
 from datetime import datetime
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import pandas as pd
-import numpy as np
 from config.settings import SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET, SPREADSHEET_KEY_ISSUES_ID, SPREADSHEET_KEY_ISSUES_PLUGINSHEET, SPREADSHEET_DATABASE_PLUGINDONESHEET, SPREADSHEET_KEY_ISSUES_MAINSHEET
-from src.google_sheets import read_google_sheet, authorize_google_sheets
-from src.fetch_jira_csv import read_jira_csv
+from src.google_sheets import read_google_sheet, write_google_sheet, append_google_sheet_rows
+from src.status_rules import STATUS_RULES
+from src.change_log import emit_changes, emit_inserts, emit_removals
 
 from datetime import datetime, timedelta
 
+JIRA_BROWSE_URL = "https://niceteam.atlassian.net/browse/"
+TICKET_ID_PATTERN = r"[A-Z]+-\d+"
+
 CLIENT_LABELS = {
     "DT": "Deutsche Telekom",
     "dtgroup": "Deutsche Telekom",
@@ -57,14 +56,25 @@ def add_hyperlinks(df, column_name="Ticket"):
     """
     Add hyperlinks to a specific column in the DataFrame if the cell matches a ticket ID pattern.
     """
-    base_url = "https://niceteam.atlassian.net/browse/"
-    ticket_pattern = re.compile(r"^[A-Z]+-\d+$")
-
-    for index, value in df[column_name].items():
-        if pd.notna(value) and ticket_pattern.match(value) and "\n" not in value:
-            df.at[index, column_name] = f'=HYPERLINK("{base_url}{value}", "{value}")'
+    # Cells that are not strings (numbers, NaN) can never match the pattern once converted
+    values = df[column_name].astype(str)
+    is_ticket = values.str.fullmatch(TICKET_ID_PATTERN).to_numpy(dtype=bool)
+    if is_ticket.any():
+        df.loc[is_ticket, column_name] = '=HYPERLINK("' + JIRA_BROWSE_URL + values[is_ticket] + '", "' + values[is_ticket] + '")'
     return df
 
+def render_ticket_links(tasks):
+    """
+    Keep the ticket id in 'TicketId', add the url columns and turn 'Ticket' into a HYPERLINK formula.
+    Works on a whole DataFrame (column-wise string operations) as well as on a single row dict.
+    """
+    tasks["TicketId"] = tasks["Ticket"]
+    tasks["url_concat"] = JIRA_BROWSE_URL
+    tasks["url_text"] = JIRA_BROWSE_URL + tasks["Ticket"]
+    tasks["url_hyperlink"] = '=HYPERLINK("' + tasks["url_text"] + '", "' + tasks["TicketId"] + '")'
+    tasks["Ticket"] = tasks["url_hyperlink"]
+    return tasks
+
 def move_done_tasks_to_archive():
     """
     Remove 'Done' or 'Released' tasks from the Plugins(All) sheet and move them to the PluginDone sheet.
@@ -76,8 +86,9 @@ def move_done_tasks_to_archive():
     # Load PluginDone sheet data for appending
     plugin_database_done_issues_df = read_google_sheet(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_PLUGINDONESHEET)
 
-    # Filter for tasks with Status 'Done' or 'Released'
-    done_or_released_df = plugin_key_issues_df[plugin_key_issues_df["Status"].isin(["Done", "Released"])]
+    # Filter for tasks with an archive status ('Done' or 'Released')
+    is_archived = plugin_key_issues_df["Status"].isin(STATUS_RULES.archive_statuses)
+    done_or_released_df = plugin_key_issues_df[is_archived]
 
     # Map and append filtered tasks to PluginDone sheet
     if not done_or_released_df.empty:
@@ -87,28 +98,22 @@ def move_done_tasks_to_archive():
         # Append archived tasks to the PluginDone DataFrame
         plugin_database_done_issues_df = pd.concat([plugin_database_done_issues_df, archived_tasks_df], ignore_index=True)
 
-        # Replace NaN and infinite values with empty strings
-        plugin_database_done_issues_df.replace([np.nan, np.inf, -np.inf], "", inplace=True)
-        
         # Add hyperlinks to the 'Ticket' column in PluginDone DataFrame
         plugin_database_done_issues_df = add_hyperlinks(plugin_database_done_issues_df, column_name="Ticket")
 
         # Remove Done or Released tasks from Plugins(All) DataFrame
-        plugin_key_issues_df = plugin_key_issues_df[~plugin_key_issues_df["Status"].isin(["Done", "Released"])]
+        plugin_key_issues_df = plugin_key_issues_df[~is_archived]
+        emit_removals(SPREADSHEET_KEY_ISSUES_ID, SPREADSHEET_KEY_ISSUES_PLUGINSHEET, done_or_released_df["Ticket"])
+        emit_inserts(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_PLUGINDONESHEET, done_or_released_df["Ticket"])
         
         # Add hyperlinks to the 'Ticket' column in Plugins(All) DataFrame
         plugin_key_issues_df = add_hyperlinks(plugin_key_issues_df, column_name="Ticket")
 
         # Write the updated PluginDone DataFrame to Google Sheets
-        client = authorize_google_sheets()
-        plugin_done_sheet = client.open_by_key(SPREADSHEET_DATABASE_ID).worksheet(SPREADSHEET_DATABASE_PLUGINDONESHEET)
-        plugin_done_sheet.clear()
-        plugin_done_sheet.append_rows([plugin_database_done_issues_df.columns.values.tolist()] + plugin_database_done_issues_df.values.tolist(), value_input_option="USER_ENTERED")
+        write_google_sheet(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_PLUGINDONESHEET, plugin_database_done_issues_df)
 
         # Write the updated Plugins(All) DataFrame back to Google Sheets
-        plugins_sheet = client.open_by_key(SPREADSHEET_KEY_ISSUES_ID).worksheet(SPREADSHEET_KEY_ISSUES_PLUGINSHEET)
-        plugins_sheet.clear()
-        plugins_sheet.append_rows([plugin_key_issues_df.columns.values.tolist()] + plugin_key_issues_df.values.tolist(), value_input_option="USER_ENTERED")
+        write_google_sheet(SPREADSHEET_KEY_ISSUES_ID, SPREADSHEET_KEY_ISSUES_PLUGINSHEET, plugin_key_issues_df)
         
         # Print summary of the operation
         print(f"\tMoved {len(done_or_released_df)} tasks to PluginDone archive and removed them from Plugins(All).")
@@ -120,10 +125,13 @@ def update_resolved_dates():
     Update the resolved dates in the Google Sheets document for tasks that are newly marked as 'Done'.
     Also, count and print how many new resolved dates were added.
     """
+    # Imported here, with the HTTP client libraries: only the steps reading Jira data need them
+    from src.fetch_jira import read_jira_data
+
     print("Step 3: Adding resolved dates for newly resolved tasks")
 
-    # Load the latest data from Jira CSV and Google Sheets
-    jira_df = read_jira_csv()
+    # Load the latest data from Jira and Google Sheets
+    jira_df = read_jira_data()
     google_sheet_df = read_google_sheet(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET)
 
     # Counter for tracking new resolved dates added
@@ -144,52 +152,19 @@ def update_resolved_dates():
             if not google_sheet_row.empty and pd.isna(google_sheet_row.iloc[0]["ResolvedDate"]):
                 # Update the Resolved Date in the Google Sheets DataFrame
                 google_sheet_df.loc[google_sheet_df["Ticket"] == ticket_id, "ResolvedDate"] = resolved_date
+                emit_changes("ResolvedDate", [ticket_id], [None], [resolved_date], sheet=(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET))
                 resolved_dates_added_count += 1  # Increment the counter
 
     # Additional logic
-    base_url = "https://niceteam.atlassian.net/browse/"
-    google_sheet_df["TicketId"] = google_sheet_df["Ticket"]
-    google_sheet_df["url_concat"] = base_url
-    google_sheet_df["url_text"] = base_url + google_sheet_df["Ticket"]
-    google_sheet_df["url_hyperlink"] = '=HYPERLINK("' + google_sheet_df["url_text"] + '", "' + google_sheet_df["TicketId"] + '")'
-    google_sheet_df["Ticket"] = google_sheet_df["url_hyperlink"]
-
-    # Write the updated DataFrame back to Google Sheets
-    client = authorize_google_sheets()
-    sheet = client.open_by_key(SPREADSHEET_DATABASE_ID).worksheet(SPREADSHEET_DATABASE_MAINSHEET)
-
-    # Clear the sheet before updating to avoid duplication
-    sheet.clear()
-
-    # Convert DataFrame to list and append it back to Google Sheets
-    sheet.append_rows([google_sheet_df.columns.values.tolist()] + google_sheet_df.values.tolist(), value_input_option="USER_ENTERED")
+    google_sheet_df = render_ticket_links(google_sheet_df)
+
+    # Write the updated DataFrame back to Google Sheets (cleared first to avoid duplication)
+    write_google_sheet(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET, google_sheet_df)
     
     # Print the results
     print("\tResolved dates updated successfully in Google Sheets.")
     print(f"\tTotal new resolved dates added: {resolved_dates_added_count}")
 
-def should_update_status(old_status, new_status):
-    """
-    Determine whether to update the status based on specific rules.
-    """
-    non_updatable_statuses = {
-        "Needs Product / Business Decision", 
-        "Out of Scope", 
-        "New UI", 
-        "Duplicate"
-    }
-    
-    # Rule: Update if the new status is "Done"
-    if new_status == "Done":
-        return True
-    
-    # Rule: Do not update if old status is in the non-updatable list
-    if old_status in non_updatable_statuses:
-        return False
-    
-    # In all other cases, allow update
-    return True
-
 def sync_plugin_tasks():
     """
     Sync plugin tasks between the DATABASE document and the Key Issues document based on the DevTeam column.
@@ -202,7 +177,7 @@ def sync_plugin_tasks():
     # Filter for tasks assigned to the "Plugin" team and exclude tasks marked as "Done" or "Won't Do"
     plugin_tasks_df = database_df[
         (database_df["DevTeam"] == "Plugin") & 
-        (~database_df["Status"].isin(["Done", "Won't Do"]))
+        (~database_df["Status"].isin(STATUS_RULES.closed_statuses))
     ]
     print(f"\tFound {len(plugin_tasks_df)} plugin tasks in the DATABASE document (excluding 'Done' and 'Won't Do' tasks).")
 
@@ -245,25 +220,29 @@ def sync_plugin_tasks():
             new_row = {key_issues_col: plugin_task[db_col] if db_col in plugin_task else "" 
                for db_col, key_issues_col in column_mapper.items()}
             
-            base_url = "https://niceteam.atlassian.net/browse/"
-            new_row["TicketId"] = new_row["Ticket"]
-            new_row["url_concat"] = base_url
-            new_row["url_text"] = base_url + new_row["Ticket"]
-            new_row["url_hyperlink"] = '=HYPERLINK("' + new_row["url_text"] + '", "' + new_row["TicketId"] + '")'
-            new_row["Ticket"] = new_row["url_hyperlink"]
+            render_ticket_links(new_row)
 
             # Convert new_row to DataFrame and concatenate
             key_issues_df = pd.concat([key_issues_df, pd.DataFrame([new_row])], ignore_index=True)
+            emit_inserts(SPREADSHEET_KEY_ISSUES_ID, SPREADSHEET_KEY_ISSUES_PLUGINSHEET, [ticket_id])
             added_count += 1
         else:
             # Task exists, update the status (taking the first match if multiple found)
             first_match_index = key_issues_task.index[0]
+            old_status = key_issues_df.at[first_match_index, "Status"]
             key_issues_df.at[first_match_index, "Status"] = latest_status
+            if old_status != latest_status:
+                emit_changes(f"{SPREADSHEET_KEY_ISSUES_PLUGINSHEET}.Status", [ticket_id], [old_status], [latest_status],
+                             sheet=(SPREADSHEET_KEY_ISSUES_ID, SPREADSHEET_KEY_ISSUES_PLUGINSHEET))
             updated_count += 1
 
             # Retrieve 'Platform' and 'V6 / V7' from Key Issues and update in the DATABASE document
             platform = key_issues_task.iloc[0].get("PluginPlatform", "")
             version = key_issues_task.iloc[0].get("PluginVersion", "")
+            for field, value in (("PluginPlatform", platform), ("PluginVersion", version)):
+                old_value = database_df.at[index, field] if field in database_df.columns else None
+                if old_value != value:
+                    emit_changes(field, [ticket_id], [old_value], [value], sheet=(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET))
             database_df.at[index, "PluginPlatform"] = platform
             database_df.at[index, "PluginVersion"] = version
 
@@ -272,35 +251,23 @@ def sync_plugin_tasks():
     key_issues_df = key_issues_df.fillna("")
 
     # Additional logic
-    base_url = "https://niceteam.atlassian.net/browse/"
-    database_df["TicketId"] = database_df["Ticket"]
-    database_df["url_concat"] = base_url
-    database_df["url_text"] = base_url + database_df["Ticket"]
-    database_df["url_hyperlink"] = '=HYPERLINK("' + database_df["url_text"] + '", "' + database_df["TicketId"] + '")'
-    database_df["Ticket"] = database_df["url_hyperlink"]
+    database_df = render_ticket_links(database_df)
 
     # SAFEGUARD: Keep a local backup of key_issues_df
     key_issues_backup = key_issues_df.copy()
     
     # Update the Key Issues document safely
-    client = authorize_google_sheets()
-    key_issues_sheet = client.open_by_key(SPREADSHEET_KEY_ISSUES_ID).worksheet(SPREADSHEET_KEY_ISSUES_PLUGINSHEET)
-    key_issues_sheet.clear()
-
-    # Append rows from the prepared DataFrame
     try:
-        key_issues_sheet.append_rows([key_issues_df.columns.values.tolist()] + key_issues_df.values.tolist(), value_input_option="USER_ENTERED")
+        write_google_sheet(SPREADSHEET_KEY_ISSUES_ID, SPREADSHEET_KEY_ISSUES_PLUGINSHEET, key_issues_df)
         print("\tKey Issues document updated successfully.")
     except Exception as e:
         # Restore from backup if there's an error
         print("Error while updating Key Issues document. Restoring from backup.")
-        key_issues_sheet.append_rows([key_issues_backup.columns.values.tolist()] + key_issues_backup.values.tolist(), value_input_option="USER_ENTERED")
+        write_google_sheet(SPREADSHEET_KEY_ISSUES_ID, SPREADSHEET_KEY_ISSUES_PLUGINSHEET, key_issues_backup)
         raise e  # Re-raise the exception to signal that something went wrong
 
     # Update the DATABASE document with 'plugin-version' and 'plugin-platform'
-    database_sheet = client.open_by_key(SPREADSHEET_DATABASE_ID).worksheet(SPREADSHEET_DATABASE_MAINSHEET)
-    database_sheet.clear()
-    database_sheet.append_rows([database_df.columns.values.tolist()] + database_df.values.tolist(), value_input_option="USER_ENTERED")
+    write_google_sheet(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET, database_df)
     print("\tDATABASE document updated with plugin version and platform information.")
 
     # Print summary results
@@ -352,25 +319,15 @@ def categorize_tasks_by_team():
             undecided_count += 1
         else:
             # Update the DevTeam column in the DataFrame
+            if row.get("DevTeam") != dev_team:
+                emit_changes("DevTeam", [ticket_id], [row.get("DevTeam")], [dev_team], sheet=(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET))
             google_sheet_df.at[index, "DevTeam"] = dev_team
 
     # Additional logic
-    base_url = "https://niceteam.atlassian.net/browse/"
-    google_sheet_df["TicketId"] = google_sheet_df["Ticket"]
-    google_sheet_df["url_concat"] = base_url
-    google_sheet_df["url_text"] = base_url + google_sheet_df["Ticket"]
-    google_sheet_df["url_hyperlink"] = '=HYPERLINK("' + google_sheet_df["url_text"] + '", "' + google_sheet_df["TicketId"] + '")'
-    google_sheet_df["Ticket"] = google_sheet_df["url_hyperlink"]
-
-    # Write the updated DataFrame back to Google Sheets
-    client = authorize_google_sheets()
-    sheet = client.open_by_key(SPREADSHEET_DATABASE_ID).worksheet(SPREADSHEET_DATABASE_MAINSHEET)
+    google_sheet_df = render_ticket_links(google_sheet_df)
 
-    # Clear the sheet before updating to avoid duplication
-    sheet.clear()
-
-    # Convert DataFrame to list and append it back to Google Sheets
-    sheet.append_rows([google_sheet_df.columns.values.tolist()] + google_sheet_df.values.tolist(), value_input_option="USER_ENTERED")
+    # Write the updated DataFrame back to Google Sheets (cleared first to avoid duplication)
+    write_google_sheet(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET, google_sheet_df)
 
     # Print the summary results
     print("\tTask categorization by team completed successfully.")
@@ -384,71 +341,47 @@ def update_task_statuses():
     Update the statuses of tasks in the Google Sheets document based on the latest Jira data.
     Also, track and print the number of statuses changed and skipped due to rules.
     """
+    from src.fetch_jira import read_jira_data
+
     print("Step 2: Updating task statuses based on the latest Jira data")
 
-    # Load the latest data from Jira CSV and Google Sheets
-    jira_df = read_jira_csv()
+    # Load the latest data from Jira and Google Sheets
+    jira_df = read_jira_data()
+    if jira_df.empty or not {"Issue key", "Status"}.issubset(jira_df.columns):
+        # No Jira data (e.g. the export is missing): nothing to update
+        print("\tNo Jira data: task statuses left unchanged.")
+        return
     google_sheet_df = read_google_sheet(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET)
 
-    # Counters for tracking changes and skips
-    changed_count = 0
-    stayedsame_count = 0
-    skipped_count = 0
-
-    # Iterate over each row in the Jira DataFrame to apply the update rules
-    for index, jira_row in jira_df.iterrows():
-        ticket_id = jira_row["Issue key"]
-        new_status = jira_row["Status"]
-
-        # Find the corresponding row in Google Sheets based on the unique ticket identifier
-        google_sheet_row = google_sheet_df[google_sheet_df["Ticket"] == ticket_id]
-        
-        if not google_sheet_row.empty:
-            old_status = google_sheet_row.iloc[0]["Status"]
-
-            # Apply the status update rule
-            if should_update_status(old_status, new_status):
-                # Update the status in Google Sheets DataFrame
-                if(old_status==new_status):
-                    stayedsame_count += 1
-                else:
-                    google_sheet_df.loc[google_sheet_df["Ticket"] == ticket_id, "Status"] = new_status
-                    changed_count += 1  # Increment changed counter
-            else:
-                skipped_count += 1  # Increment skipped counter
+    # Latest Jira status of every database ticket (NaN for tickets not in the Jira data)
+    jira_statuses = jira_df.drop_duplicates(subset="Issue key", keep="last").set_index("Issue key")["Status"]
+    old_statuses = google_sheet_df["Status"]
+    new_statuses = google_sheet_df["Ticket"].map(jira_statuses)
+
+    # Apply the status update rules to the whole column at once
+    in_jira = new_statuses.notna().to_numpy()
+    allowed = STATUS_RULES.status_update_mask(old_statuses, new_statuses)
+    same = (old_statuses == new_statuses).to_numpy()
+    changed = in_jira & allowed & ~same
+    emit_changes("Status", google_sheet_df["Ticket"][changed], old_statuses[changed], new_statuses[changed],
+                 sheet=(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET))
+    google_sheet_df.loc[changed, "Status"] = new_statuses[changed]
+
+    # Count once per ticket
+    first_rows = ~google_sheet_df["Ticket"].duplicated().to_numpy()
+    changed_count = int((changed & first_rows).sum())
+    stayedsame_count = int((in_jira & allowed & same & first_rows).sum())
+    skipped_count = int((in_jira & ~allowed & first_rows).sum())
 
     # keeping the hyperlinks
-    base_url = "https://niceteam.atlassian.net/browse/"
-    google_sheet_df["TicketId"] = google_sheet_df["Ticket"]
-    google_sheet_df["url_concat"] = base_url
-    google_sheet_df["url_text"] = base_url + google_sheet_df["Ticket"]
-    google_sheet_df["url_hyperlink"] = '=HYPERLINK("' + google_sheet_df["url_text"] + '", "' + google_sheet_df["TicketId"] + '")'
-    google_sheet_df["Ticket"] = google_sheet_df["url_hyperlink"]
+    google_sheet_df = render_ticket_links(google_sheet_df)
     
-    # Write the updated DataFrame back to Google Sheets
-    client = authorize_google_sheets()
-    sheet = client.open_by_key(SPREADSHEET_DATABASE_ID).worksheet(SPREADSHEET_DATABASE_MAINSHEET)
-
-    # Clear the sheet before updating to avoid duplication
-    sheet.clear()
-
-    # Convert DataFrame to list and append it back to Google Sheets
-    sheet.append_rows([google_sheet_df.columns.values.tolist()] + google_sheet_df.values.tolist(), value_input_option="USER_ENTERED")
+    # Write the updated DataFrame back to Google Sheets (cleared first to avoid duplication)
+    write_google_sheet(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET, google_sheet_df)
     
     # Print the results
     print(f"\tTask statuses updated w/ statuses changed: {changed_count}, same status: {stayedsame_count}, skipped due to rules: {skipped_count}")
 
-def calculate_sla_limit(priority):
-    """
-    Determine SLA Limit based on Priority.
-    """
-    if priority == "5-Blocker" or priority == "4-Critical":
-        return 3
-    elif priority == "3-Major":
-        return 10
-    else:
-        return 60
-
 def calculate_sla_deadline(row):
     """
     Calculate SLA Deadline as Creation Date + SLA Limit days.
@@ -497,19 +430,6 @@ def determine_client(row):
     # Join client names with a comma if multiple clients are identified
     return ", ".join(clients) if clients else ""
 
-def transform_priority(priority):
-    """
-    Convert Jira priority to custom format for database.
-    """
-    priority_mapping = {
-        "Blocker": "5-Blocker",
-        "Critical": "4-Critical",
-        "Major": "3-Major",
-        "Minor": "2-Minor",
-        "Trivial": "1-Trivial"
-    }
-    return priority_mapping.get(priority, priority)
-
 def format_date(date_str):
     """
     Format date to "DD-MMM-YYYY" format, ensuring no time component is included.
@@ -571,20 +491,15 @@ def prepare_new_tasks(jira_df, database_df):
         return new_tasks_df
 
     # Apply transformations
-    new_tasks_df["Priority"] = new_tasks_df["Priority"].apply(transform_priority)
+    new_tasks_df["Priority"] = STATUS_RULES.transform_priorities(new_tasks_df["Priority"])
     new_tasks_df["CreationDate"] = new_tasks_df["CreationDate"].apply(format_date)
     new_tasks_df["ResolvedDate"] = new_tasks_df["ResolvedDate"].apply(format_date)
 
     # Additional logic
-    base_url = "https://niceteam.atlassian.net/browse/"
-    new_tasks_df["TicketId"] = new_tasks_df["Ticket"]
-    new_tasks_df["url_concat"] = base_url
-    new_tasks_df["url_text"] = base_url + new_tasks_df["Ticket"]
-    new_tasks_df["url_hyperlink"] = '=HYPERLINK("' + new_tasks_df["url_text"] + '", "' + new_tasks_df["TicketId"] + '")'
-    new_tasks_df["Ticket"] = new_tasks_df["url_hyperlink"]
+    new_tasks_df = render_ticket_links(new_tasks_df)
     
     # Calculate SLA Limit based on Priority
-    new_tasks_df["SLALimit"] = new_tasks_df["Priority"].apply(calculate_sla_limit)
+    new_tasks_df["SLALimit"] = STATUS_RULES.sla_limits_for(new_tasks_df["Priority"])
 
     # Calculate SLA Deadline
     new_tasks_df["SLADeadline"] = new_tasks_df.apply(calculate_sla_deadline, axis=1)
@@ -598,6 +513,10 @@ def prepare_new_tasks(jira_df, database_df):
     # Determine client based on labels
     new_tasks_df["Client"] = new_tasks_df.apply(determine_client, axis=1)
 
+    # Flag likely duplicates of existing tickets (summary + client similarity)
+    from src.duplicate_detection import assign_duplicate_ids
+    new_tasks_df = assign_duplicate_ids(new_tasks_df, database_df, key_column="TicketId", database_key_column="Ticket")
+
     # Add missing columns with default values to match Google Sheets structure
     expected_columns = [
         "Ticket", "Client", "Type", "Priority", "Status", "Summary",
@@ -618,10 +537,12 @@ def append_new_tasks_to_database():
     """
     Append new tasks from Jira to the Google Sheets database and print them to the console.
     """
+    from src.fetch_jira import read_jira_data
+
     print("Step 1: Appending new tasks to the database")
 
-    # Load data from Jira CSV and Google Sheets database
-    jira_data = read_jira_csv()
+    # Load data from Jira and Google Sheets database
+    jira_data = read_jira_data()
     database_data = read_google_sheet(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET)
 
     # Prepare new tasks
@@ -631,13 +552,14 @@ def append_new_tasks_to_database():
         print("\tNo new tasks to append.")
         return
 
-    # Append new tasks to Google Sheets
-    client = authorize_google_sheets()
-    sheet = client.open_by_key(SPREADSHEET_DATABASE_ID).worksheet(SPREADSHEET_DATABASE_MAINSHEET)
-
-    # Convert DataFrame to list of lists and append to Google Sheets
-    first_new_task_list = new_tasks_df.values.tolist()
-    sheet.append_rows(first_new_task_list, value_input_option="USER_ENTERED")
+    # Record the new tasks, then append them to Google Sheets (the events are logged once the rows landed)
+    database_sheet = (SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET)
+    emit_inserts(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET, new_tasks_df["TicketId"])
+    emit_changes("Status", new_tasks_df["TicketId"], [None] * len(new_tasks_df), new_tasks_df["Status"], sheet=database_sheet)
+    has_duplicate = new_tasks_df["DuplicateID"] != ""
+    emit_changes("DuplicateID", new_tasks_df["TicketId"][has_duplicate], [None] * int(has_duplicate.sum()), new_tasks_df["DuplicateID"][has_duplicate],
+                 sheet=database_sheet)
+    append_google_sheet_rows(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET, new_tasks_df)
     print("\tNew tasks successfully appended to the Google Sheets database.")
 
 def find_new_tasks(jira_df, database_df, jira_key_column="Issue key", database_key_column="TICKET"):
@@ -674,53 +596,28 @@ def update_backend_frontend_status():
     key_issues_backend_frontend_df = read_google_sheet(SPREADSHEET_KEY_ISSUES_ID, SPREADSHEET_KEY_ISSUES_MAINSHEET)
     all_tasks_df = read_google_sheet(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET)
 
-    # Define statuses that require removal
-    removal_statuses = {
-        "Beta", "PENDING TO DEPLOY", "Ready to Launch", "Waiting to Deploy",
-        "UAT / Waiting Customer", 
-        "New UI Beta", 
-        "Won't Do", "Done"
-    }
-
-    # Counter for tracking changes and removals
-    updated_count = 0
-    removed_count = 0
-
-    # Iterate over each task in the Backend/Frontend sheet
-    for index, backend_task in key_issues_backend_frontend_df.iterrows():
-        ticket_id = backend_task["Ticket"]  # Unique identifier
-        backend_status = backend_task["Status"]
-
-        # Find the corresponding row in all-tasks based on the unique ticket identifier
-        all_tasks_row = all_tasks_df[all_tasks_df["Ticket"] == ticket_id]
-        
-        if not all_tasks_row.empty:
-            latest_status = all_tasks_row.iloc[0]["Status"]
+    # Latest all-tasks status of every Backend/Frontend task (NaN for tasks not in all-tasks)
+    all_tasks_statuses = all_tasks_df.drop_duplicates(subset="Ticket", keep="first").set_index("Ticket")["Status"]
+    latest_statuses = key_issues_backend_frontend_df["Ticket"].map(all_tasks_statuses)
 
-            # Check if the status has changed
-            if backend_status != latest_status:
-                # Update the status in Backend/Frontend DataFrame
-                key_issues_backend_frontend_df.loc[index, "Status"] = latest_status
-                updated_count += 1
+    # Update changed statuses, and remove tasks whose updated status is in the removal list
+    changed = latest_statuses.notna() & (key_issues_backend_frontend_df["Status"] != latest_statuses)
+    removed = changed & latest_statuses.isin(STATUS_RULES.removal_statuses)
+    emit_changes(f"{SPREADSHEET_KEY_ISSUES_MAINSHEET}.Status", key_issues_backend_frontend_df["Ticket"][changed],
+                 key_issues_backend_frontend_df["Status"][changed], latest_statuses[changed],
+                 sheet=(SPREADSHEET_KEY_ISSUES_ID, SPREADSHEET_KEY_ISSUES_MAINSHEET))
+    emit_removals(SPREADSHEET_KEY_ISSUES_ID, SPREADSHEET_KEY_ISSUES_MAINSHEET, key_issues_backend_frontend_df["Ticket"][removed])
+    key_issues_backend_frontend_df.loc[changed, "Status"] = latest_statuses[changed]
+    key_issues_backend_frontend_df = key_issues_backend_frontend_df[~removed]
 
-                # If the updated status is in the removal list, mark the task for removal
-                if latest_status in removal_statuses:
-                    key_issues_backend_frontend_df.drop(index, inplace=True)
-                    removed_count += 1
+    updated_count = int(changed.sum())
+    removed_count = int(removed.sum())
 
     # keeping the hyperlinks
-    base_url = "https://niceteam.atlassian.net/browse/"
-    key_issues_backend_frontend_df["TicketId"] = key_issues_backend_frontend_df["Ticket"]
-    key_issues_backend_frontend_df["url_concat"] = base_url
-    key_issues_backend_frontend_df["url_text"] = base_url + key_issues_backend_frontend_df["Ticket"]
-    key_issues_backend_frontend_df["url_hyperlink"] = '=HYPERLINK("' + key_issues_backend_frontend_df["url_text"] + '", "' + key_issues_backend_frontend_df["TicketId"] + '")'
-    key_issues_backend_frontend_df["Ticket"] = key_issues_backend_frontend_df["url_hyperlink"]
+    key_issues_backend_frontend_df = render_ticket_links(key_issues_backend_frontend_df)
 
     # Write the updated Backend/Frontend DataFrame back to Google Sheets
-    client = authorize_google_sheets()
-    backend_frontend_sheet = client.open_by_key(SPREADSHEET_KEY_ISSUES_ID).worksheet(SPREADSHEET_KEY_ISSUES_MAINSHEET)
-    backend_frontend_sheet.clear()
-    backend_frontend_sheet.append_rows([key_issues_backend_frontend_df.columns.values.tolist()] + key_issues_backend_frontend_df.values.tolist(), value_input_option="USER_ENTERED")
+    write_google_sheet(SPREADSHEET_KEY_ISSUES_ID, SPREADSHEET_KEY_ISSUES_MAINSHEET, key_issues_backend_frontend_df)
     
     # Print summary of the operation
     print(f"\tUpdated statuses for {updated_count} tasks in Backend/Frontend.")
@@ -740,24 +637,13 @@ def reorder_backlog_backend_tasks_insert_to_key_issues():
 
     # Filter tasks: status is To Do or In Progress, and DevTeam is NOT Plugin
     filtered_db_tasks = database_all_tasks_df[
-        (database_all_tasks_df["Status"].isin(["Backlog"
-                                      , "Todo - Backend"
-                                      , "In Dev - Backend"
-                                      , "Waiting PR - Backend"
-                                      , "QA - Backend"
-                                      , "Todo - Frontend"
-                                      , "In Dev - Frontend"
-                                      , "QA - Frontend"
-                                      , "To Do"
-                                      , "In Progress"
-                                      , "Requires Engineering assessment"])) &
+        (database_all_tasks_df["Status"].isin(STATUS_RULES.active_statuses)) &
         (database_all_tasks_df["DevTeam"] != "Plugin") & 
         (~database_all_tasks_df["Ticket"].str.startswith("PRODREQ-"))
     ]
 
     # Sort by Priority and SLA Overdue Days
-    priority_order = {"5-Blocker": 5, "4-Critical": 4, "3-Major": 3, "2-Minor": 2, "1-Trivial": 1}
-    filtered_db_tasks["PriorityOrder"] = filtered_db_tasks["Priority"].map(priority_order)
+    filtered_db_tasks["PriorityOrder"] = STATUS_RULES.priority_rank(filtered_db_tasks["Priority"])
     filtered_db_tasks = filtered_db_tasks.sort_values(
         by=["PriorityOrder", "SLAOverdueDays"],
         ascending=[False, False]
@@ -777,6 +663,7 @@ def reorder_backlog_backend_tasks_insert_to_key_issues():
         if(existing_key_issue_item.empty):
             # Insert new task
             key_issues_backend_frontend_df = pd.concat([key_issues_backend_frontend_df, pd.DataFrame([task])], ignore_index=True)
+            emit_inserts(SPREADSHEET_KEY_ISSUES_ID, SPREADSHEET_KEY_ISSUES_MAINSHEET, [ticket_id])
             upserted_count += 1
 
     # Clean up the DataFrame before writing to Google Sheets
@@ -784,18 +671,10 @@ def reorder_backlog_backend_tasks_insert_to_key_issues():
     key_issues_backend_frontend_df.fillna("", inplace=True)
 
     # keeping the hyperlinks
-    base_url = "https://niceteam.atlassian.net/browse/"
-    key_issues_backend_frontend_df["TicketId"] = key_issues_backend_frontend_df["Ticket"]
-    key_issues_backend_frontend_df["url_concat"] = base_url
-    key_issues_backend_frontend_df["url_text"] = base_url + key_issues_backend_frontend_df["Ticket"]
-    key_issues_backend_frontend_df["url_hyperlink"] = '=HYPERLINK("' + key_issues_backend_frontend_df["url_text"] + '", "' + key_issues_backend_frontend_df["TicketId"] + '")'
-    key_issues_backend_frontend_df["Ticket"] = key_issues_backend_frontend_df["url_hyperlink"]
+    key_issues_backend_frontend_df = render_ticket_links(key_issues_backend_frontend_df)
 
     # Write the updated Backend/Frontend DataFrame back to Google Sheets
-    client = authorize_google_sheets()
-    backend_frontend_sheet = client.open_by_key(SPREADSHEET_KEY_ISSUES_ID).worksheet(SPREADSHEET_KEY_ISSUES_MAINSHEET)
-    backend_frontend_sheet.clear()
-    backend_frontend_sheet.append_rows([key_issues_backend_frontend_df.columns.values.tolist()] + key_issues_backend_frontend_df.values.tolist(), value_input_option="USER_ENTERED")
+    write_google_sheet(SPREADSHEET_KEY_ISSUES_ID, SPREADSHEET_KEY_ISSUES_MAINSHEET, key_issues_backend_frontend_df)
     
     # Print summary of the operation
     print(f"\tUpserted top 25 tasks to Backend/Frontend. Total new tasks inserted: {upserted_count}")
@@ -0,0 +1,246 @@
+# src/duplicate_detection.py
+
+import os
+import re
+import pickle
+import zlib
+
+import numpy as np
+import pandas as pd
+from config.settings import DUPLICATE_INDEX_PATH
+
+# MinHash / LSH parameters: 32 bands x 4 rows gives a ~50% match probability
+# around a Jaccard similarity of 0.42 and ~95% above 0.65.
+NUM_PERM = 128
+NUM_BANDS = 32
+ROWS_PER_BAND = NUM_PERM // NUM_BANDS
+SHINGLE_SIZE = 5
+SIMILARITY_THRESHOLD = 0.6
+
+_MERSENNE_PRIME = np.uint64((1 << 31) - 1)
+_SEED = 1
+
+def normalize_text(text):
+    """
+    Lowercase the text and collapse everything that is not a letter or digit into single spaces.
+    """
+    if not isinstance(text, str):
+        return ""
+    return re.sub(r"[^a-z0-9]+", " ", text.lower()).strip()
+
+def build_shingles(summary, client=""):
+    """
+    Build the shingle set of a ticket from its summary and client.
+
+    Only fields stored in the database sheet are used, so a ticket gets the same
+    signature whether it was indexed as a new task or synced from the database.
+
+    Parameters:
+        summary (str): The ticket summary.
+        client (str): Comma separated client names (as produced by determine_client).
+
+    Returns:
+        set: Character shingles of the summary plus one token per client.
+    """
+    text = normalize_text(summary)
+    shingles = set()
+    if len(text) <= SHINGLE_SIZE:
+        if text:
+            shingles.add(text)
+    else:
+        shingles.update(text[i:i + SHINGLE_SIZE] for i in range(len(text) - SHINGLE_SIZE + 1))
+
+    if isinstance(client, str):
+        shingles.update(f"client:{name.strip().lower()}" for name in client.split(",") if name.strip())
+    return shingles
+
+class MinHashLSHIndex:
+    """
+    Persistent MinHash signature store with banded LSH buckets.
+
+    Querying a ticket only touches the buckets its own signature hashes to,
+    so the cost per new ticket does not grow with the size of the backlog.
+    """
+
+    def __init__(self, num_perm=NUM_PERM, num_bands=NUM_BANDS):
+        self.num_perm = num_perm
+        self.num_bands = num_bands
+        self.rows_per_band = num_perm // num_bands
+        generator = np.random.RandomState(_SEED)
+        self.perm_a = generator.randint(1, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self.perm_b = generator.randint(0, int(_MERSENNE_PRIME), size=num_perm, dtype=np.uint64)
+        self.buckets = [dict() for _ in range(num_bands)]
+        self.signatures = {}
+        # Tickets seen without any shingles (empty summary): known, but not matchable
+        self.empty_keys = set()
+
+    def __len__(self):
+        return len(self.signatures)
+
+    def __contains__(self, key):
+        return key in self.signatures or key in self.empty_keys
+
+    def known_keys(self):
+        """
+        All tickets the index has seen, including those without shingles.
+        """
+        return self.signatures.keys() | self.empty_keys
+
+    def signature(self, shingles):
+        """
+        Compute the MinHash signature of a shingle set.
+        """
+        if not shingles:
+            return None
+        hashes = np.fromiter((zlib.crc32(s.encode("utf-8")) for s in shingles), dtype=np.uint64, count=len(shingles))
+        # (a * h + b) mod p for every permutation / shingle pair in one broadcasted operation
+        permuted = (np.outer(hashes, self.perm_a) + self.perm_b) % _MERSENNE_PRIME
+        return permuted.min(axis=0).astype(np.uint32)
+
+    def _band_keys(self, signature):
+        bands = signature.reshape(self.num_bands, self.rows_per_band)
+        return [band.tobytes() for band in bands]
+
+    def add(self, key, shingles):
+        """
+        Add (or replace) a ticket in the index. Tickets without shingles are only remembered as seen.
+
+        Returns:
+            bool: True if the ticket got a signature.
+        """
+        signature = self.signature(shingles)
+        self.remove(key)
+        if signature is None:
+            self.empty_keys.add(key)
+            return False
+        self.signatures[key] = signature
+        for band_index, band_key in enumerate(self._band_keys(signature)):
+            self.buckets[band_index].setdefault(band_key, set()).add(key)
+        return True
+
+    def remove(self, key):
+        """
+        Remove a ticket from the index if it is present.
+        """
+        self.empty_keys.discard(key)
+        signature = self.signatures.pop(key, None)
+        if signature is None:
+            return
+        for band_index, band_key in enumerate(self._band_keys(signature)):
+            bucket = self.buckets[band_index].get(band_key)
+            if bucket is not None:
+                bucket.discard(key)
+                if not bucket:
+                    del self.buckets[band_index][band_key]
+
+    def query(self, shingles, threshold=SIMILARITY_THRESHOLD, exclude=None):
+        """
+        Find indexed tickets whose estimated Jaccard similarity is at least the threshold.
+
+        Parameters:
+            shingles (set): Shingles of the ticket to look up.
+            threshold (float): Minimum estimated Jaccard similarity.
+            exclude (str): Optional key to leave out of the results (the ticket itself).
+
+        Returns:
+            list: (key, similarity) tuples sorted by descending similarity.
+        """
+        signature = self.signature(shingles)
+        if signature is None:
+            return []
+
+        candidates = set()
+        for band_index, band_key in enumerate(self._band_keys(signature)):
+            candidates.update(self.buckets[band_index].get(band_key, ()))
+        candidates.discard(exclude)
+        if not candidates:
+            return []
+
+        candidates = list(candidates)
+        candidate_signatures = np.stack([self.signatures[key] for key in candidates])
+        similarities = (candidate_signatures == signature).mean(axis=1)
+        matches = [(key, float(sim)) for key, sim in zip(candidates, similarities) if sim >= threshold]
+        return sorted(matches, key=lambda match: (-match[1], match[0]))
+
+    def save(self, path=DUPLICATE_INDEX_PATH):
+        """
+        Persist the index to disk, writing to a temporary file first so a crash never leaves a truncated index.
+        """
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(tmp_path, path)
+
+    @classmethod
+    def load(cls, path=DUPLICATE_INDEX_PATH):
+        """
+        Load the index from disk, or return an empty index if none exists yet.
+        """
+        if not os.path.exists(path):
+            return cls()
+        with open(path, "rb") as f:
+            index = pickle.load(f)
+        if not isinstance(index, cls) or index.num_perm != NUM_PERM or index.num_bands != NUM_BANDS:
+            print("\tDuplicate index parameters changed, rebuilding the index.")
+            return cls()
+        if not hasattr(index, "empty_keys"):
+            index.empty_keys = set()
+        return index
+
+def sync_index_with_database(index, database_df, database_key_column="Ticket"):
+    """
+    Incrementally add database tickets that are not in the index yet.
+
+    Returns:
+        int: Number of tickets added to the index with a signature.
+    """
+    if database_df.empty or database_key_column not in database_df.columns:
+        return 0
+
+    missing_df = database_df[~database_df[database_key_column].isin(index.known_keys())]
+    added_count = 0
+    for ticket_id, summary, client in zip(missing_df[database_key_column],
+                                          missing_df.get("Summary", pd.Series("", index=missing_df.index)),
+                                          missing_df.get("Client", pd.Series("", index=missing_df.index))):
+        if isinstance(ticket_id, str) and ticket_id:
+            added_count += index.add(ticket_id, build_shingles(summary, client))
+    return added_count
+
+def assign_duplicate_ids(new_tasks_df, database_df, key_column="TicketId", database_key_column="Ticket",
+                         index_path=DUPLICATE_INDEX_PATH, threshold=SIMILARITY_THRESHOLD):
+    """
+    Fill the 'DuplicateID' column of new tasks with the most similar existing ticket.
+
+    The MinHash/LSH index on disk is first brought up to date with the database,
+    then each new task is looked up and added, so duplicates within the same batch are found too.
+
+    Parameters:
+        new_tasks_df (pd.DataFrame): New tasks with plain ticket ids in the key column.
+        database_df (pd.DataFrame): Existing tasks from the database sheet.
+        key_column (str): The plain ticket id column in new_tasks_df.
+        database_key_column (str): The ticket id column in database_df.
+        index_path (str): Where the index is persisted.
+        threshold (float): Minimum estimated Jaccard similarity to flag a duplicate.
+
+    Returns:
+        pd.DataFrame: new_tasks_df with the 'DuplicateID' column filled where a likely duplicate exists.
+    """
+    index = MinHashLSHIndex.load(index_path)
+    synced_count = sync_index_with_database(index, database_df, database_key_column=database_key_column)
+
+    duplicate_ids = []
+    for _, row in new_tasks_df.iterrows():
+        ticket_id = row[key_column]
+        shingles = build_shingles(row.get("Summary"), row.get("Client", ""))
+        matches = index.query(shingles, threshold=threshold, exclude=ticket_id)
+        duplicate_ids.append(matches[0][0] if matches else "")
+        index.add(ticket_id, shingles)
+
+    new_tasks_df["DuplicateID"] = duplicate_ids
+    index.save(index_path)
+
+    flagged_count = sum(1 for duplicate_id in duplicate_ids if duplicate_id)
+    print(f"\tDuplicate index synced with {synced_count} database tasks ({len(index)} indexed). Likely duplicates found: {flagged_count}")
+    return new_tasks_df
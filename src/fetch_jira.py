@@ -0,0 +1,245 @@
+# src/fetch_jira.py
+
+import os
+import re
+import json
+from datetime import datetime, timedelta, timezone
+from zoneinfo import ZoneInfo
+
+import pandas as pd
+import numpy as np
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from config.settings import JIRA_SOURCE, JIRA_CSV_PATH, JIRA_BASE_URL, JIRA_EMAIL, JIRA_API_TOKEN, JIRA_JQL, JIRA_LAST_RUN_PATH
+from src.fetch_jira_csv import read_jira_csv
+
+# Only the fields the pipeline reads from the Jira export
+JIRA_FIELDS = ["summary", "status", "issuetype", "priority", "created", "resolutiondate", "labels"]
+# Issues per page; the enhanced search API accepts large pages when only a few fields are requested
+PAGE_SIZE = 1000
+SEARCH_PATH = "/rest/api/3/search/jql"
+MYSELF_PATH = "/rest/api/3/myself"
+# Incremental fetches reach back this far before the last run: an issue seen twice is simply processed again
+SINCE_OVERLAP = timedelta(minutes=15)
+
+_jira_cache = None
+_fetch_started_at = None
+_csv_cache = None
+
+def create_jira_session(email=JIRA_EMAIL, api_token=JIRA_API_TOKEN):
+    """
+    Create a requests session that keeps its connection alive between pages and retries transient errors.
+
+    Parameters:
+        email (str): The Jira account email used for basic auth.
+        api_token (str): The Jira API token.
+
+    Returns:
+        requests.Session: The configured session.
+    """
+    session = requests.Session()
+    session.auth = (email, api_token)
+    session.headers.update({"Accept": "application/json", "Content-Type": "application/json"})
+    retry = Retry(total=3, backoff_factor=0.5, status_forcelist=[429, 500, 502, 503, 504], allowed_methods=["POST"])
+    adapter = HTTPAdapter(max_retries=retry)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+def fetch_user_timezone(session, base_url):
+    """
+    Return the time zone of the API user's Jira profile, in which Jira reads the dates of a JQL query.
+    """
+    response = session.get(f"{base_url.rstrip('/')}{MYSELF_PATH}")
+    response.raise_for_status()
+    return ZoneInfo(response.json().get("timeZone") or "UTC")
+
+def build_jql(base_jql=JIRA_JQL, since=None, jira_timezone=timezone.utc):
+    """
+    Restrict the base JQL to issues updated since the given datetime, and order it by key
+    unless it already has an ORDER BY, so that paging walks a stable result.
+
+    Parameters:
+        base_jql (str): The JQL selecting the project's issues.
+        since (datetime): Timezone-aware start of the update window (None for all issues).
+        jira_timezone (tzinfo): Time zone of the API user's Jira profile.
+    """
+    # ORDER BY has to stay at the end of the query
+    parts = re.split(r"\s+ORDER\s+BY\s+", base_jql or "", maxsplit=1, flags=re.IGNORECASE)
+    query = parts[0].strip()
+    order_by = parts[1].strip() if len(parts) > 1 else "key"
+    if since is not None:
+        # JQL dates have no zone and minute precision: written in the user's zone, reaching back SINCE_OVERLAP
+        since_local = (since - SINCE_OVERLAP).astimezone(jira_timezone)
+        since_clause = f'updated >= "{since_local.strftime("%Y/%m/%d %H:%M")}"'
+        query = f"({query}) AND {since_clause}" if query else since_clause
+    return f"{query} ORDER BY {order_by}" if query else f"ORDER BY {order_by}"
+
+def fetch_search_page(session, base_url, jql, next_page_token=None, page_size=PAGE_SIZE):
+    """
+    Fetch a single page of the Jira enhanced search API (POST /rest/api/3/search/jql).
+
+    Parameters:
+        next_page_token (str): Token returned with the previous page (None for the first page).
+
+    Returns:
+        dict: The decoded JSON response (with 'issues' and, unless it is the last page, 'nextPageToken').
+    """
+    body = {"jql": jql, "maxResults": page_size, "fields": JIRA_FIELDS}
+    if next_page_token:
+        body["nextPageToken"] = next_page_token
+    response = session.post(f"{base_url.rstrip('/')}{SEARCH_PATH}", json=body)
+    response.raise_for_status()
+    return response.json()
+
+def _field_name(value):
+    return value.get("name") if isinstance(value, dict) else value
+
+def _format_jira_datetime(value):
+    # "2024-11-18T15:15:00.000+0100" -> "2024-11-18 15:15:00", keeping Jira's wall-clock time like the CSV export does
+    return value[:19].replace("T", " ") if isinstance(value, str) else np.nan
+
+def issues_to_dataframe(issues):
+    """
+    Convert a page of Jira issues into the same columns as the Jira CSV export.
+
+    Parameters:
+        issues (list): The 'issues' list of a search API response.
+
+    Returns:
+        pd.DataFrame: One row per issue, with labels spread over 'Labels', 'Labels.1', ... columns.
+    """
+    records = []
+    for issue in issues:
+        fields = issue.get("fields", {})
+        record = {
+            "Issue key": issue.get("key"),
+            "Issue Type": _field_name(fields.get("issuetype")),
+            "Status": _field_name(fields.get("status")),
+            "Priority": _field_name(fields.get("priority")),
+            "Summary": fields.get("summary"),
+            "Created": fields.get("created"),
+            "Resolved": fields.get("resolutiondate")
+        }
+        for position, label in enumerate(fields.get("labels") or []):
+            record["Labels" if position == 0 else f"Labels.{position}"] = label
+        records.append(record)
+
+    df = pd.DataFrame(records, columns=["Issue key", "Issue Type", "Status", "Priority", "Summary", "Created", "Resolved"])
+    if records:
+        label_df = pd.DataFrame([{k: v for k, v in record.items() if k.startswith("Labels")} for record in records])
+        df = pd.concat([df, label_df], axis=1)
+    for column in ["Created", "Resolved"]:
+        df[column] = df[column].map(_format_jira_datetime)
+    return df
+
+def fetch_jira_issues(since=None, base_url=JIRA_BASE_URL, jql=JIRA_JQL, session=None, page_size=PAGE_SIZE):
+    """
+    Fetch all issues matching the JQL, following the search API's page tokens.
+
+    Each page names the next one, so pages are requested one after the other over
+    a single kept-alive connection, with large pages to keep the round trips few.
+
+    Parameters:
+        since (datetime): Only fetch issues updated since this timezone-aware time (None for a full fetch).
+        base_url (str): The Jira base URL, e.g. "https://niceteam.atlassian.net".
+        jql (str): The base JQL selecting the project's issues.
+        session (requests.Session): Optional session to reuse.
+        page_size (int): Issues per page.
+
+    Returns:
+        pd.DataFrame: The issues in the same schema as read_jira_csv.
+    """
+    session = session or create_jira_session()
+    # The user's time zone only matters for the since clause of an incremental fetch
+    jira_timezone = fetch_user_timezone(session, base_url) if since is not None else timezone.utc
+    query = build_jql(jql, since, jira_timezone)
+
+    frames = []
+    next_page_token = None
+    while True:
+        page = fetch_search_page(session, base_url, query, next_page_token, page_size)
+        frames.append(issues_to_dataframe(page.get("issues", [])))
+        next_page_token = page.get("nextPageToken")
+        if page.get("isLast", next_page_token is None) or not next_page_token:
+            break
+
+    df = pd.concat(frames, ignore_index=True)
+    # Pages can shift while we read them if issues are updated mid-fetch
+    df = df.drop_duplicates(subset="Issue key", keep="last").reset_index(drop=True)
+    print(f"\tJira API: {len(df)} issues fetched{' (updated since ' + since.strftime('%Y-%m-%d %H:%M %Z') + ')' if since else ''}.")
+    return df
+
+def load_last_run(path=JIRA_LAST_RUN_PATH):
+    """
+    Load the time of the last successful incremental fetch (timezone-aware, UTC), or None if there was none.
+    """
+    if not os.path.exists(path):
+        return None
+    with open(path, "r") as f:
+        last_run = datetime.fromisoformat(json.load(f)["last_run"])
+    # Markers written before they carried a zone hold the host's local time
+    return last_run.astimezone(timezone.utc)
+
+def save_last_run(path=JIRA_LAST_RUN_PATH):
+    """
+    Record the start time of this run's fetch so the next run only fetches issues updated since.
+    Call this once the pipeline finished successfully.
+    """
+    if _fetch_started_at is None:
+        return
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, "w") as f:
+        json.dump({"last_run": _fetch_started_at.astimezone(timezone.utc).isoformat()}, f)
+
+def read_jira_data():
+    """
+    Return the Jira issues for this run, from the CSV export or the REST API depending on JIRA_SOURCE.
+
+    The CSV is parsed again only when the export file changed. The API fetch happens once
+    per run (see reset_jira_cache) and is incremental since the last saved run.
+
+    Returns:
+        pd.DataFrame: The Jira issues in the CSV export schema.
+    """
+    global _jira_cache, _fetch_started_at, _csv_cache
+    if JIRA_SOURCE != "api":
+        if not os.path.exists(JIRA_CSV_PATH):
+            return read_jira_csv()
+        modified_at = os.path.getmtime(JIRA_CSV_PATH)
+        if _csv_cache is None or _csv_cache[0] != modified_at:
+            _csv_cache = (modified_at, read_jira_csv())
+        return _csv_cache[1].copy()
+
+    if _jira_cache is None:
+        _fetch_started_at = datetime.now(timezone.utc)
+        _jira_cache = fetch_jira_issues(since=load_last_run())
+    return _jira_cache.copy()
+
+def get_jira_state():
+    """
+    Return (issues, fetch start time) of this run's API fetch, or (None, None) if nothing was fetched.
+    """
+    return _jira_cache, _fetch_started_at
+
+def restore_jira_state(issues_df, fetch_started_at):
+    """
+    Reuse issues fetched earlier (e.g. restored from a checkpoint) instead of fetching them again.
+    """
+    global _jira_cache, _fetch_started_at
+    _jira_cache = issues_df
+    _fetch_started_at = fetch_started_at
+
+def reset_jira_cache():
+    """
+    Forget the issues fetched from the API, so the next read_jira_data call fetches the updates since the last run.
+    """
+    global _jira_cache, _fetch_started_at
+    _jira_cache = None
+    _fetch_started_at = None
+
+# Example usage
+if __name__ == "__main__":
+    jira_df = fetch_jira_issues(since=load_last_run())
+    print(jira_df.head())
@@ -1,21 +1,232 @@
-import sys
-import os
-sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+import time
+import threading
 
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
+import numpy as np
 import pandas as pd
 from config.settings import SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET, SPREADSHEET_KEY_ISSUES_ID, SPREADSHEET_KEY_ISSUES_MAINSHEET, CREDENTIALS_FILE
 
+# Matches the cells written as =HYPERLINK("url", "label"); the sheet displays (and get_all_records returns) the label
+HYPERLINK_PATTERN = r'^=HYPERLINK\("[^"]*",\s*"([^"]*)"\)$'
+
+_client = None
+_spreadsheets = {}
+_worksheets = {}
+_sheet_cache = {}
+_sheet_cache_ttl = None
+_preloaded_sheets = {}
+_write_listeners = []
+_rate_limiter = None
+_lock = threading.RLock()
+
+def set_rate_limiter(rate_limiter):
+    """
+    Route every Google Sheets API request through rate_limiter.acquire() (None to disable),
+    e.g. to share the API quota between several pipelines running in parallel.
+    """
+    global _rate_limiter
+    _rate_limiter = rate_limiter
+
+def _throttle():
+    if _rate_limiter is not None:
+        _rate_limiter.acquire()
+
 def authorize_google_sheets():
     """
-    Authorize and return a Google Sheets client.
+    Authorize and return a Google Sheets client. The client is created once per process and reused.
+    """
+    global _client
+    with _lock:
+        if _client is None:
+            # Imported on first use: runs served from the sheet cache or a checkpoint never load the Google client libraries
+            import gspread
+            from oauth2client.service_account import ServiceAccountCredentials
+            scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/spreadsheets",
+                     "https://www.googleapis.com/auth/drive.file", "https://www.googleapis.com/auth/drive"]
+            credentials = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_FILE, scope)
+            _throttle()
+            _client = gspread.authorize(credentials)
+        return _client
+
+def get_spreadsheet(spreadsheet_id):
+    """
+    Return the spreadsheet handle, opening the spreadsheet only the first time it is requested.
+    """
+    with _lock:
+        if spreadsheet_id not in _spreadsheets:
+            client = authorize_google_sheets()
+            _throttle()
+            _spreadsheets[spreadsheet_id] = client.open_by_key(spreadsheet_id)
+        return _spreadsheets[spreadsheet_id]
+
+def get_worksheet(spreadsheet_id, sheet_name):
+    """
+    Return the worksheet handle, opening it only the first time it is requested.
+    """
+    with _lock:
+        key = (spreadsheet_id, sheet_name)
+        if key not in _worksheets:
+            spreadsheet = get_spreadsheet(spreadsheet_id)
+            _throttle()
+            _worksheets[key] = spreadsheet.worksheet(sheet_name)
+        return _worksheets[key]
+
+def spreadsheet_modified_time(spreadsheet_id):
+    """
+    Last modification time of the spreadsheet (Drive 'modifiedTime'), changed by any edit, manual or not.
+    """
+    _throttle()
+    return get_spreadsheet(spreadsheet_id).get_lastUpdateTime()
+
+def enable_sheet_cache(ttl_seconds):
+    """
+    Keep sheet contents in memory between reads for up to ttl_seconds.
+
+    Sheets written through write_google_sheet are cached as written. A cached sheet is only
+    served while its spreadsheet's modification time is still the one seen when it was
+    cached, so manual edits made in the meantime are always read from Google Sheets.
+    """
+    global _sheet_cache_ttl
+    _sheet_cache_ttl = ttl_seconds
+
+def clear_sheet_cache():
+    """
+    Drop every cached sheet, so the next reads download fresh data.
+    """
+    with _lock:
+        _sheet_cache.clear()
+        _preloaded_sheets.clear()
+
+def preload_sheet(spreadsheet_id, sheet_name, df, modified_time):
+    """
+    Provide known contents of one sheet (e.g. restored from a checkpoint), so that it is not downloaded again.
+
+    Reads of that sheet are served from these contents while the spreadsheet's modification time
+    is still modified_time. The preload applies to this sheet alone and ends with its next write.
+    """
+    with _lock:
+        _preloaded_sheets[(spreadsheet_id, sheet_name)] = (df, modified_time)
+
+def _preloaded_sheet(spreadsheet_id, sheet_name):
+    with _lock:
+        preloaded = _preloaded_sheets.get((spreadsheet_id, sheet_name))
+    if preloaded is None:
+        return None
+    df, modified_time = preloaded
+    if modified_time is not None and spreadsheet_modified_time(spreadsheet_id) == modified_time:
+        return df.copy()
+    # Modified since (e.g. edited by hand): the preloaded contents are stale for good
+    with _lock:
+        _preloaded_sheets.pop((spreadsheet_id, sheet_name), None)
+    return None
+
+class SheetWrite:
+    """
+    A completed sheet write, as passed to the write listeners.
+
+    df holds the sheet contents as read back (hyperlinks shown as their label) for full writes,
+    and is None for appends, whose resulting sheet contents are unknown without a read.
+    modified_time is the spreadsheet's modification time right after the write.
+    Both cost a full frame copy or a Drive request, so they are only computed on first access.
+    """
+    def __init__(self, spreadsheet_id, sheet_name, written_df=None):
+        self.spreadsheet_id = spreadsheet_id
+        self.sheet_name = sheet_name
+        self._written_df = written_df
+        self._df = None
+        self._modified_time = None
+
+    @property
+    def df(self):
+        if self._df is None and self._written_df is not None:
+            self._df = _displayed_values(self._written_df)
+        return self._df
+
+    @property
+    def modified_time(self):
+        if self._modified_time is None:
+            self._modified_time = spreadsheet_modified_time(self.spreadsheet_id)
+        return self._modified_time
+
+def add_write_listener(listener):
+    """
+    Register listener(write) to be called with a SheetWrite after every sheet write.
     """
-    scope = ["https://spreadsheets.google.com/feeds", "https://www.googleapis.com/auth/spreadsheets",
-             "https://www.googleapis.com/auth/drive.file", "https://www.googleapis.com/auth/drive"]
-    credentials = ServiceAccountCredentials.from_json_keyfile_name(CREDENTIALS_FILE, scope)
-    client = gspread.authorize(credentials)
-    return client
+    with _lock:
+        _write_listeners.append(listener)
+
+def remove_write_listener(listener):
+    with _lock:
+        if listener in _write_listeners:
+            _write_listeners.remove(listener)
+
+def _notify_write(write):
+    with _lock:
+        listeners = list(_write_listeners)
+    for listener in listeners:
+        listener(write)
+
+def _cache_sheet(spreadsheet_id, sheet_name, df, modified_time):
+    if _sheet_cache_ttl is None:
+        return
+    with _lock:
+        _sheet_cache[(spreadsheet_id, sheet_name)] = (time.monotonic(), df, modified_time)
+
+def _sheet_values(series):
+    """
+    Cell values of a column as an object array of plain Python values, with NaN / inf / None as blank cells.
+    """
+    values = series.to_numpy()
+    if values.dtype.kind in "iub":
+        # No missing values possible: only box the numbers as Python ints / bools
+        return values.astype(object)
+    if values.dtype.kind == "f":
+        blank = ~np.isfinite(values)
+        values = values.astype(object)
+    else:
+        values = series.to_numpy(dtype=object, na_value=None)
+        blank = series.isna().to_numpy()
+        # inf can hide in object columns (e.g. a ratio computed on mixed data), never in string columns
+        if pd.api.types.is_object_dtype(series):
+            blank = blank | (values == np.inf) | (values == -np.inf)
+        if not blank.any():
+            return values
+        values = values.copy()
+    values[blank] = ""
+    return values
+
+def _sheet_rows(df, header=True):
+    """
+    Serialize a DataFrame to sheet rows, sent to Google Sheets in a single request.
+
+    Each column is converted on its own (numeric columns stay numeric, blanks become ""),
+    so the frame is never cast as a whole to a mixed-type array.
+
+    Parameters:
+        df (pd.DataFrame): The data to serialize.
+        header (bool): Start with a row of column names.
+
+    Returns:
+        list: The rows, as lists of cell values.
+    """
+    header_row = [[str(column) for column in df.columns]] if header else []
+    # Filled column by column, then turned into row lists in one C-level pass
+    cells = np.empty(df.shape, dtype=object)
+    for position in range(df.shape[1]):
+        cells[:, position] = _sheet_values(df.iloc[:, position])
+    return header_row + cells.tolist()
+
+def _displayed_values(df):
+    # What get_all_records would return for a frame we just wrote: hyperlink formulas show their label, blanks read back as ""
+    displayed_df = df.copy()
+    for column in displayed_df.columns:
+        values = displayed_df[column]
+        if pd.api.types.is_object_dtype(values) or pd.api.types.is_string_dtype(values):
+            labels = values.astype(str).str.extract(HYPERLINK_PATTERN, expand=False)
+            values = labels.where(labels.notna(), values)
+            displayed_df[column] = values if values.notna().all() else _sheet_values(values)
+        elif pd.api.types.is_float_dtype(values) and not np.isfinite(values.to_numpy()).all():
+            displayed_df[column] = _sheet_values(values)
+    return displayed_df.reset_index(drop=True)
 
 def read_google_sheet(spreadsheet_id, sheet_name):
     """
@@ -28,11 +239,91 @@ def read_google_sheet(spreadsheet_id, sheet_name):
     Returns:
         pd.DataFrame: The data from the specified sheet as a DataFrame.
     """
-    client = authorize_google_sheets()
-    sheet = client.open_by_key(spreadsheet_id).worksheet(sheet_name)
+    preloaded_df = _preloaded_sheet(spreadsheet_id, sheet_name)
+    if preloaded_df is not None:
+        return preloaded_df
+
+    modified_time = None
+    if _sheet_cache_ttl is not None:
+        with _lock:
+            cached = _sheet_cache.get((spreadsheet_id, sheet_name))
+        # One Drive metadata request tells whether anything (e.g. a manual edit) changed the spreadsheet since
+        modified_time = spreadsheet_modified_time(spreadsheet_id)
+        if cached is not None and time.monotonic() - cached[0] < _sheet_cache_ttl and cached[2] == modified_time:
+            return cached[1].copy()
+
+    sheet = get_worksheet(spreadsheet_id, sheet_name)
+    _throttle()
     data = sheet.get_all_records()
     df = pd.DataFrame(data)
-    return df
+    # Taken before the read: an edit racing the read makes the entry stale rather than hiding the edit
+    _cache_sheet(spreadsheet_id, sheet_name, df, modified_time)
+    return df.copy() if _sheet_cache_ttl is not None else df
+
+def write_google_sheet(spreadsheet_id, sheet_name, df):
+    """
+    Replace the content of a sheet with the DataFrame (header + rows).
+
+    Parameters:
+        spreadsheet_id (str): The ID of the Google Sheets document.
+        sheet_name (str): The name of the sheet within the document to write.
+        df (pd.DataFrame): The data to write.
+    """
+    values = _sheet_rows(df)
+    sheet = get_worksheet(spreadsheet_id, sheet_name)
+    _throttle()
+    sheet.clear()
+    # All rows in one request after the clear: a failed write leaves the sheet empty, never
+    # half written (callers that cannot afford that, like sync_plugin_tasks, write a backup back)
+    _throttle()
+    sheet.append_rows(values, value_input_option="USER_ENTERED")
+    with _lock:
+        _preloaded_sheets.pop((spreadsheet_id, sheet_name), None)
+    write = SheetWrite(spreadsheet_id, sheet_name, df)
+    if _sheet_cache_ttl is not None:
+        _cache_sheet(spreadsheet_id, sheet_name, write.df, write.modified_time)
+    _notify_write(write)
+
+def append_google_sheet_rows(spreadsheet_id, sheet_name, df):
+    """
+    Append the DataFrame rows (without header) at the end of a sheet.
+    """
+    values = _sheet_rows(df, header=False)
+    if not values:
+        return
+    sheet = get_worksheet(spreadsheet_id, sheet_name)
+    _throttle()
+    sheet.append_rows(values, value_input_option="USER_ENTERED")
+    with _lock:
+        _sheet_cache.pop((spreadsheet_id, sheet_name), None)
+        _preloaded_sheets.pop((spreadsheet_id, sheet_name), None)
+    _notify_write(SheetWrite(spreadsheet_id, sheet_name))
+
+def update_google_sheet(spreadsheet_id, sheet_name, df):
+    """
+    Replace the content of a small sheet (e.g. a report) in one batched update, creating the sheet if needed.
+
+    Parameters:
+        spreadsheet_id (str): The ID of the Google Sheets document.
+        sheet_name (str): The name of the sheet within the document to write.
+        df (pd.DataFrame): The data to write (header + rows).
+    """
+    import gspread
+    values = _sheet_rows(df)
+    try:
+        sheet = get_worksheet(spreadsheet_id, sheet_name)
+    except gspread.exceptions.WorksheetNotFound:
+        _throttle()
+        sheet = get_spreadsheet(spreadsheet_id).add_worksheet(title=sheet_name, rows=max(len(values), 1), cols=max(len(values[0]) if values else 1, 1))
+        with _lock:
+            _worksheets[(spreadsheet_id, sheet_name)] = sheet
+    _throttle()
+    sheet.clear()
+    _throttle()
+    sheet.update(values, value_input_option="USER_ENTERED")
+    with _lock:
+        _sheet_cache.pop((spreadsheet_id, sheet_name), None)
+        _preloaded_sheets.pop((spreadsheet_id, sheet_name), None)
 
 def print_summary(df, description="Data"):
     """
@@ -1,38 +1,171 @@
 # src/main.py
-import data_processing
+import sys
+import os
+import argparse
+import importlib
+from datetime import datetime
 
-def main():
+# The entry point of the pipeline: started as a script (python src/main.py), it makes the
+# repository root importable once for all the modules, which import from config/src/utils.
+if not __package__:
+    sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# Only the standard library is imported up front: each step's module (and with it pandas,
+# the Google client libraries, pyarrow...) is imported when a selected step first needs it.
+from src import daemon
+from src import batch
+
+# Pipeline steps in run order: (step name, module defining the function of the same name).
+# The names identify completed steps in the run checkpoint and select steps on the command line.
+PIPELINE_STEPS = [
     # Step 1: Append new tasks to the database
-    data_processing.append_new_tasks_to_database()
-    
+    ("append_new_tasks_to_database", "src.data_processing"),
     # Step 2: Update task statuses and based on the latest Jira data
-    data_processing.update_task_statuses()
-
+    ("update_task_statuses", "src.data_processing"),
     # Step 3: Add resolve dates for newly resolved tasks
-    data_processing.update_resolved_dates()
-
+    ("update_resolved_dates", "src.data_processing"),
     # Step 4: Categorize plugin / backend / frontend
-    data_processing.categorize_tasks_by_team()
-
+    ("categorize_tasks_by_team", "src.data_processing"),
     # Step 5: Sync Plugin tasks (Database -> Key Issues)
-    data_processing.sync_plugin_tasks()
-    
+    ("sync_plugin_tasks", "src.data_processing"),
     # Step 6: Remove Done tasks from Key Issues - move them to Database
-    data_processing.move_done_tasks_to_archive()
-
+    ("move_done_tasks_to_archive", "src.data_processing"),
     # Step 7: Update and clean tasks in Key Issues: Backend/Frontend
-    data_processing.update_backend_frontend_status()
-
+    ("update_backend_frontend_status", "src.data_processing"),
     # Step 8: Reorder backend/frontend tasks in Database, and try to insert top issues to Key Issues
-    data_processing.reorder_backlog_backend_tasks_insert_to_key_issues()
-    
-    # 9	update summary (for backend+frontend)
-    # 10	maybe update summary for plugin	
-    # 11	sort by range - Priority + SLA days overdue	
-    # 12	Filter (NOT plugin & todo & in progress)	
-    # 13	last controls & send to CE CSMs	
-    # 14	send 'excom' email to Till	
-    # 15	send task list to Ferran & Devs	
+    ("reorder_backlog_backend_tasks_insert_to_key_issues", "src.data_processing"),
+    # Keep today's status of every ticket for time-in-status / cycle time / aging queries
+    ("record_status_snapshot", "src.status_history"),
+    # Step 9-12: Summaries (backend/frontend + plugin), Priority + SLA sort, filter view (NOT plugin & todo & in progress)
+    ("generate_reports", "src.report_generator"),
+    # Step 13-15: Send task lists to CE CSMs, 'excom' email and task list to devs
+    ("send_notifications", "src.notifications")
+]
+STEP_NAMES = [step_name for step_name, _ in PIPELINE_STEPS]
+# Watch mode runs on every new export: the emails go out with the scheduled runs only, not on every update
+WATCH_STEP_NAMES = [step_name for step_name in STEP_NAMES if step_name != "send_notifications"]
+
+def load_step(step_name):
+    """
+    Import the module of a pipeline step and return its function.
+    """
+    module_name = dict(PIPELINE_STEPS)[step_name]
+    return getattr(importlib.import_module(module_name), step_name)
+
+def main(fresh=False, step_names=STEP_NAMES):
+    """
+    Run the pipeline once, resuming an unfinished run if there is one.
+
+    Parameters:
+        fresh (bool): Ignore the checkpoint of an unfinished run and start from step 1.
+        step_names (list): The steps of the run (all of them by default; watch mode leaves out the emails).
+
+    Returns:
+        str: The run id.
+    """
+    from src.fetch_jira import save_last_run
+    from src.checkpoints import RunCheckpoint
+    from src import change_log
+
+    # Resume an unfinished run from its first incomplete step, unless asked to start over
+    checkpoint = RunCheckpoint.start_or_resume(fresh=fresh)
+    change_log.start_run(checkpoint.run_id)
+
+    for step_name in step_names:
+        if checkpoint.is_completed(step_name):
+            print(f"Skipping {step_name} (completed in run {checkpoint.run_id})")
+            continue
+        # Change events are logged as their sheets are written; those of unwritten sheets are dropped
+        with checkpoint.step(step_name), change_log.step(step_name):
+            load_step(step_name)()
+
+    # Remember this run so the next Jira API fetch is incremental
+    save_last_run()
+    checkpoint.finish()
+    return checkpoint.run_id
+
+def run_watch_cycle():
+    """
+    One run of watch mode: the pipeline without the emails (see WATCH_STEP_NAMES).
+    """
+    return main(step_names=WATCH_STEP_NAMES)
+
+def run_steps(step_names):
+    """
+    Run only the given steps, in pipeline order, e.g. for a quick fix of the statuses.
+
+    A partial run leaves the checkpoint of an unfinished full run alone and does not move the
+    incremental Jira fetch marker, since the skipped steps have not seen the fetched issues.
+    Its change events are still logged, under their own run id.
+
+    Returns:
+        str: The run id.
+    """
+    from src import change_log
+
+    run_id = datetime.now().strftime("%Y%m%d-%H%M%S") + "-steps"
+    change_log.start_run(run_id)
+    for step_name in STEP_NAMES:
+        if step_name in step_names:
+            with change_log.step(step_name):
+                load_step(step_name)()
+    return run_id
+
+def parse_step_names(value):
+    step_names = [step_name.strip() for step_name in value.split(",") if step_name.strip()]
+    unknown = [step_name for step_name in step_names if step_name not in STEP_NAMES]
+    if unknown:
+        raise argparse.ArgumentTypeError(f"unknown step(s): {', '.join(unknown)} (see the 'steps' command)")
+    return step_names
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Update the backlog database and Key Issues sheets from Jira.")
+    subparsers = parser.add_subparsers(dest="command")
+
+    run_parser = subparsers.add_parser("run", help="run the pipeline once (the default command)")
+    # Steps run on their own never use the checkpoint, so --fresh would have nothing to ignore
+    run_options = run_parser.add_mutually_exclusive_group()
+    run_options.add_argument("--steps", type=parse_step_names, help="comma-separated steps to run on their own, in pipeline order")
+    run_options.add_argument("--fresh", action="store_true", help="ignore the checkpoint of an unfinished run and start from step 1")
+
+    watch_parser = subparsers.add_parser("watch", help="keep running and process every new Jira export as it arrives")
+    watch_parser.add_argument("--poll-interval", type=int, default=daemon.DEFAULT_POLL_INTERVAL, help="seconds between checks of the Jira export")
+    watch_parser.add_argument("--api-poll-interval", type=int, default=daemon.DEFAULT_API_POLL_INTERVAL, help="seconds between incremental Jira API fetches")
+    watch_parser.add_argument("--sheet-cache-ttl", type=int, default=daemon.DEFAULT_SHEET_CACHE_TTL, help="seconds sheets stay cached in memory")
+    watch_parser.add_argument("--health-port", type=int, default=daemon.DEFAULT_HEALTH_PORT, help="local port of the /health and /metrics endpoint")
+
+    batch_parser = subparsers.add_parser("batch", help="run the pipeline for several projects in parallel")
+    batch_parser.add_argument("projects", help="JSON file listing the projects and their settings overrides")
+    batch_parser.add_argument("--workers", type=int, default=batch.DEFAULT_WORKERS, help="number of projects run at the same time")
+    batch_parser.add_argument("--sheets-requests-per-minute", type=int, default=batch.DEFAULT_SHEETS_REQUESTS_PER_MINUTE, help="Google Sheets request budget shared by all projects")
+    batch_parser.add_argument("--fresh", action="store_true", help="ignore the checkpoints of unfinished runs")
+
+    subparsers.add_parser("steps", help="list the pipeline steps")
+
+    argv = list(sys.argv[1:] if argv is None else argv)
+    # Options from before the subcommands existed: --watch [options] means "watch [options]",
+    # and no command (or only run options) means "run"
+    if not argv or (argv[0].startswith("-") and argv[0] not in ("-h", "--help")):
+        if "--watch" in argv:
+            argv.remove("--watch")
+            argv = ["watch"] + argv
+        else:
+            argv = ["run"] + argv
+    return parser.parse_args(argv)
 
 if __name__ == "__main__":
-    main()
+    args = parse_args()
+    if args.command == "steps":
+        for position, step_name in enumerate(STEP_NAMES, start=1):
+            print(f"{position:2d}. {step_name}")
+    elif args.command == "watch":
+        daemon.run_daemon(run_watch_cycle, poll_interval=args.poll_interval, api_poll_interval=args.api_poll_interval,
+                          sheet_cache_ttl=args.sheet_cache_ttl, health_port=args.health_port)
+    elif args.command == "batch":
+        report = batch.run_batch(batch.load_projects(args.projects), workers=args.workers,
+                                 requests_per_minute=args.sheets_requests_per_minute, fresh=args.fresh)
+        sys.exit(1 if report["failed"] else 0)
+    elif args.steps:
+        run_steps(args.steps)
+    else:
+        main(fresh=args.fresh)
@@ -0,0 +1,167 @@
+# src/notifications.py
+
+from datetime import datetime
+
+import pandas as pd
+from config.settings import SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET, SMTP_HOST, SMTP_PORT, SMTP_USERNAME, SMTP_PASSWORD, SMTP_USE_TLS, EMAIL_SENDER, EMAIL_DRY_RUN, EMAIL_DRY_RUN_DIR, CSM_RECIPIENTS, EXCOM_RECIPIENTS, DEV_RECIPIENTS
+from src.google_sheets import read_google_sheet
+from src.status_rules import STATUS_RULES
+from src.report_generator import build_summary, build_open_tasks_view, sort_by_priority_and_sla, compute_sla_overdue_days
+from utils.email_utils import compile_templates, render_task_lines, build_message, SMTPConnectionPool, DryRunSink, send_messages
+
+EMAIL_WORKERS = 4
+TASK_COLUMNS = ["Ticket", "Priority", "Status", "SLAOverdueDays", "Summary"]
+
+TEMPLATES = compile_templates({
+    "csm_subject": "[Backlog] $client - $task_count open tasks ($breached_count over SLA) - $date",
+    "csm_body": (
+        "Hi,\n\n"
+        "These are the open tasks for $client as of $date.\n"
+        "$breached_count of them are past their SLA deadline.\n\n"
+        "$task_lines\n\n"
+        "Backlog Updater\n"
+    ),
+    "excom_subject": "[Backlog] Excom summary - $date",
+    "excom_body": (
+        "Hi,\n\n"
+        "Backlog status as of $date: $task_count tasks, $breached_count over SLA ($breach_rate).\n\n"
+        "By team:\n$team_lines\n\n"
+        "By priority:\n$priority_lines\n\n"
+        "Backlog Updater\n"
+    ),
+    "dev_subject": "[Backlog] Top backend/frontend tasks - $date",
+    "dev_body": (
+        "Hi,\n\n"
+        "These are the open backend/frontend tasks ordered by priority and SLA overdue days.\n\n"
+        "$task_lines\n\n"
+        "Backlog Updater\n"
+    )
+})
+
+def _plain_tickets(tasks_df):
+    # The sheet can hold =HYPERLINK(...) formulas in Ticket; mails show the TicketId instead
+    if "TicketId" in tasks_df.columns:
+        tasks_df = tasks_df.assign(Ticket=tasks_df["TicketId"].where(tasks_df["TicketId"].astype(str) != "", tasks_df["Ticket"]))
+    return tasks_df
+
+def _is_breached(tasks_df):
+    # Same deadline-based computation as the reports: the sheet's SLAOverdueDays is only set when a task is added
+    return compute_sla_overdue_days(tasks_df) > 0
+
+def build_csm_messages(tasks_df, csm_recipients=CSM_RECIPIENTS, date=None):
+    """
+    Build one email per client CSM listing the client's open tasks (all teams, not Done / Won't Do).
+
+    Parameters:
+        tasks_df (pd.DataFrame): The database (all-tasks) sheet.
+        csm_recipients (dict): Client name -> list of CSM email addresses.
+        date (str): Date shown in the email.
+
+    Returns:
+        list: EmailMessage objects, one per client with open tasks.
+    """
+    date = date or datetime.today().strftime("%d-%b-%Y")
+    open_tasks_df = sort_by_priority_and_sla(tasks_df[~tasks_df["Status"].isin(STATUS_RULES.closed_statuses)])
+    # One row per (task, client) so multi-client tasks reach every CSM
+    client_tasks_df = open_tasks_df.assign(Client=open_tasks_df["Client"].fillna("").astype(str).str.split(r"\s*,\s*")).explode("Client")
+
+    messages = []
+    for client, tasks_df in client_tasks_df.groupby("Client", sort=True):
+        recipients = csm_recipients.get(client)
+        if not client or not recipients:
+            continue
+        values = {
+            "client": client,
+            "date": date,
+            "task_count": len(tasks_df),
+            "breached_count": int(_is_breached(tasks_df).sum()),
+            "task_lines": render_task_lines(tasks_df, TASK_COLUMNS)
+        }
+        messages.append(build_message(EMAIL_SENDER, recipients,
+                                      TEMPLATES["csm_subject"].substitute(values),
+                                      TEMPLATES["csm_body"].substitute(values)))
+    return messages
+
+def build_excom_message(summary_df, recipients=EXCOM_RECIPIENTS, date=None):
+    """
+    Build the excom email from the summary report (see build_summary).
+    """
+    date = date or datetime.today().strftime("%d-%b-%Y")
+    total_df = summary_df[summary_df["Dimension"] == "Total"]
+    # An empty task table has no Total row: report zeros
+    total = total_df.iloc[0] if not total_df.empty else {"Tasks": 0, "SLABreached": 0, "SLABreachRate": 0.0}
+    summary_columns = ["Value", "Tasks", "SLABreached", "SLABreachRate", "DaysToCompleteP50"]
+    values = {
+        "date": date,
+        "task_count": int(total["Tasks"]),
+        "breached_count": int(total["SLABreached"]),
+        "breach_rate": f"{total['SLABreachRate']:.0%}",
+        "team_lines": render_task_lines(summary_df[summary_df["Dimension"] == "DevTeam"], summary_columns),
+        "priority_lines": render_task_lines(summary_df[summary_df["Dimension"] == "Priority"], summary_columns)
+    }
+    return build_message(EMAIL_SENDER, recipients,
+                         TEMPLATES["excom_subject"].substitute(values),
+                         TEMPLATES["excom_body"].substitute(values))
+
+def build_dev_message(open_tasks_df, recipients=DEV_RECIPIENTS, date=None, limit=25):
+    """
+    Build the task list email for the developers (top open backend/frontend tasks).
+    """
+    date = date or datetime.today().strftime("%d-%b-%Y")
+    values = {
+        "date": date,
+        "task_lines": render_task_lines(open_tasks_df.head(limit), TASK_COLUMNS)
+    }
+    return build_message(EMAIL_SENDER, recipients,
+                         TEMPLATES["dev_subject"].substitute(values),
+                         TEMPLATES["dev_body"].substitute(values))
+
+def create_transport(dry_run=EMAIL_DRY_RUN):
+    """
+    Return the pooled SMTP transport, or a dry-run sink that only stores the messages.
+    """
+    if dry_run:
+        return DryRunSink(output_dir=EMAIL_DRY_RUN_DIR)
+    return SMTPConnectionPool(SMTP_HOST, SMTP_PORT, username=SMTP_USERNAME, password=SMTP_PASSWORD, use_tls=SMTP_USE_TLS)
+
+def send_notifications(tasks_df=None, transport=None):
+    """
+    Send the CSM, excom and developer emails (steps 13-15) concurrently over one pooled transport.
+
+    Parameters:
+        tasks_df (pd.DataFrame): Optional in-memory database sheet; read from Google Sheets if not given.
+        transport: Optional transport; built from the settings if not given.
+
+    Returns:
+        tuple: (sent_count, failures)
+    """
+    print("Step 13: Sending task lists to CE CSMs, excom summary and developer task list")
+
+    if tasks_df is None:
+        tasks_df = read_google_sheet(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET)
+    tasks_df = _plain_tickets(tasks_df)
+    # The task lines show the overdue days as of today
+    tasks_df = tasks_df.assign(SLAOverdueDays=compute_sla_overdue_days(tasks_df))
+
+    # Last controls before sending: every message is built before the first one goes out
+    open_tasks_df = build_open_tasks_view(tasks_df)
+    messages = build_csm_messages(tasks_df)
+    if EXCOM_RECIPIENTS:
+        messages.append(build_excom_message(build_summary(tasks_df)))
+    if DEV_RECIPIENTS:
+        messages.append(build_dev_message(open_tasks_df))
+
+    transport = transport or create_transport()
+    try:
+        sent_count, failures = send_messages(transport, messages, max_workers=EMAIL_WORKERS)
+    finally:
+        transport.close()
+
+    for message, error in failures:
+        print(f"\tError sending '{message['Subject']}' to {message['To']}: {error}")
+    print(f"\tEmails sent: {sent_count}, failed: {len(failures)}{' (dry run)' if isinstance(transport, DryRunSink) else ''}")
+    return sent_count, failures
+
+# Example usage
+if __name__ == "__main__":
+    send_notifications(transport=DryRunSink())
@@ -0,0 +1,173 @@
+# src/report_generator.py
+
+import os
+import json
+from datetime import datetime
+
+import pandas as pd
+import numpy as np
+from config.settings import SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET, SPREADSHEET_KEY_ISSUES_ID, SPREADSHEET_KEY_ISSUES_SUMMARYSHEET, REPORT_OUTPUT_DIR
+from src.google_sheets import read_google_sheet, update_google_sheet
+from src.status_rules import STATUS_RULES
+
+# Dimensions summarized in the report; "DevTeam / Status" gives the per-team status breakdown
+SUMMARY_DIMENSIONS = ["DevTeam", "Status", "Priority", "Client", "DevTeam / Status"]
+DAYS_TO_COMPLETE_PERCENTILES = [0.5, 0.75, 0.9]
+SUMMARY_COLUMNS = ["Dimension", "Value", "Tasks", "SLABreached", "SLABreachRate", "ResolvedTasks",
+                   "DaysToCompleteP50", "DaysToCompleteP75", "DaysToCompleteP90"]
+
+SHEET_DATE_FORMAT = "%d-%b-%Y"
+
+def _blank_to_none(series):
+    return series.fillna("").astype(str).str.strip().replace("", "(none)")
+
+def compute_sla_overdue_days(tasks_df, today=None):
+    """
+    Days each task went past its SLA deadline: until it was resolved, or until today while it is open.
+
+    The SLAOverdueDays column of the sheet is only filled in when a task is added, so it is
+    recomputed here from SLADeadline and ResolvedDate.
+
+    Parameters:
+        tasks_df (pd.DataFrame): Tasks with SLADeadline (and ResolvedDate) in the sheet's "DD-MMM-YYYY" format.
+        today (datetime): The reference date for open tasks (default: today).
+
+    Returns:
+        pd.Series: Overdue days per task (0 when within the SLA or without a valid deadline).
+    """
+    today = pd.Timestamp(today or datetime.today()).normalize()
+    deadline = pd.to_datetime(tasks_df["SLADeadline"], format=SHEET_DATE_FORMAT, errors="coerce")
+    resolved = pd.to_datetime(tasks_df.get("ResolvedDate", pd.Series("", index=tasks_df.index)), format=SHEET_DATE_FORMAT, errors="coerce")
+    overdue_days = (resolved.fillna(today) - deadline).dt.days
+    return overdue_days.fillna(0).clip(lower=0).astype(int)
+
+def build_summary(tasks_df, today=None):
+    """
+    Build all summary aggregates in a single grouped pass over the task table.
+
+    The task table is melted to one (Dimension, Value) pair per task and dimension,
+    so counts, SLA breach rates and DaysToComplete percentiles for every dimension
+    come out of one groupby instead of one filter per metric.
+
+    Parameters:
+        tasks_df (pd.DataFrame): The database (all-tasks) sheet.
+        today (datetime): The reference date of the SLA breaches of open tasks (default: today).
+
+    Returns:
+        pd.DataFrame: One row per dimension value with the SUMMARY_COLUMNS.
+    """
+    if tasks_df.empty:
+        return pd.DataFrame(columns=SUMMARY_COLUMNS)
+
+    team = _blank_to_none(tasks_df["DevTeam"])
+    status = _blank_to_none(tasks_df["Status"])
+    measures_df = pd.DataFrame({
+        "Breached": compute_sla_overdue_days(tasks_df, today).to_numpy() > 0,
+        "DaysToComplete": pd.to_numeric(tasks_df["DaysToComplete"], errors="coerce").to_numpy(),
+        "All": "All tasks",
+        "DevTeam": team.to_numpy(),
+        "Status": status.to_numpy(),
+        "Priority": _blank_to_none(tasks_df["Priority"]).to_numpy(),
+        # A task can belong to several clients ("Globo, RTL"); it is counted once for each of them
+        "Client": _blank_to_none(tasks_df["Client"]).str.split(r"\s*,\s*").to_numpy(),
+        "DevTeam / Status": (team + " / " + status).to_numpy()
+    })
+
+    long_df = measures_df.melt(id_vars=["Breached", "DaysToComplete"], value_vars=["All"] + SUMMARY_DIMENSIONS,
+                               var_name="Dimension", value_name="Value").explode("Value")
+    long_df["Dimension"] = long_df["Dimension"].replace("All", "Total")
+
+    grouped = long_df.groupby(["Dimension", "Value"], sort=False)
+    summary_df = grouped.agg(Tasks=("Breached", "size"),
+                             SLABreached=("Breached", "sum"),
+                             SLABreachRate=("Breached", "mean"),
+                             ResolvedTasks=("DaysToComplete", "count"))
+    percentiles_df = grouped["DaysToComplete"].quantile(DAYS_TO_COMPLETE_PERCENTILES).unstack()
+    percentiles_df.columns = [f"DaysToCompleteP{int(q * 100)}" for q in DAYS_TO_COMPLETE_PERCENTILES]
+
+    summary_df = summary_df.join(percentiles_df).reset_index()
+    summary_df["SLABreachRate"] = summary_df["SLABreachRate"].round(3)
+    dimension_order = {dimension: position for position, dimension in enumerate(["Total"] + SUMMARY_DIMENSIONS)}
+    summary_df["DimensionOrder"] = summary_df["Dimension"].map(dimension_order)
+    summary_df = summary_df.sort_values(by=["DimensionOrder", "Tasks"], ascending=[True, False])
+    return summary_df[SUMMARY_COLUMNS].reset_index(drop=True)
+
+def sort_by_priority_and_sla(tasks_df, today=None):
+    """
+    Sort tasks by Priority and SLA Overdue Days (as of today), both descending.
+    """
+    sort_keys = pd.DataFrame({
+        "PriorityOrder": STATUS_RULES.priority_rank(tasks_df["Priority"]),
+        "SLAOverdueDays": compute_sla_overdue_days(tasks_df, today)
+    })
+    order = sort_keys.sort_values(by=["PriorityOrder", "SLAOverdueDays"], ascending=[False, False]).index
+    return tasks_df.loc[order].reset_index(drop=True)
+
+def build_open_tasks_view(tasks_df, today=None):
+    """
+    Filter view of open backend/frontend tasks (NOT plugin, to do / in progress),
+    sorted by Priority and SLA Overdue Days.
+    """
+    open_tasks_df = tasks_df[
+        (tasks_df["Status"].isin(STATUS_RULES.active_statuses)) &
+        (tasks_df["DevTeam"] != "Plugin") &
+        (~tasks_df["Ticket"].astype(str).str.startswith("PRODREQ-"))
+    ]
+    return sort_by_priority_and_sla(open_tasks_df, today)
+
+def write_summary_to_sheet(summary_df, spreadsheet_id=SPREADSHEET_KEY_ISSUES_ID, sheet_name=SPREADSHEET_KEY_ISSUES_SUMMARYSHEET):
+    """
+    Write the summary to its worksheet in one batched update, creating the worksheet if needed.
+    """
+    update_google_sheet(spreadsheet_id, sheet_name, summary_df)
+
+def write_reports_to_files(summary_df, open_tasks_df, output_dir=REPORT_OUTPUT_DIR, run_date=None):
+    """
+    Write the summary as CSV and JSON and the open tasks view as CSV to the local report directory.
+
+    Returns:
+        list: The paths written.
+    """
+    run_date = run_date or datetime.today().strftime("%Y-%m-%d")
+    os.makedirs(output_dir, exist_ok=True)
+
+    summary_csv_path = os.path.join(output_dir, f"summary_{run_date}.csv")
+    summary_json_path = os.path.join(output_dir, f"summary_{run_date}.json")
+    open_tasks_csv_path = os.path.join(output_dir, f"open_tasks_{run_date}.csv")
+
+    summary_df.to_csv(summary_csv_path, index=False)
+    summary_records = summary_df.replace({np.nan: None}).to_dict(orient="records")
+    with open(summary_json_path, "w") as f:
+        json.dump({"date": run_date, "summary": summary_records}, f, indent=2)
+    open_tasks_df.to_csv(open_tasks_csv_path, index=False)
+    return [summary_csv_path, summary_json_path, open_tasks_csv_path]
+
+def generate_reports(tasks_df=None):
+    """
+    Build the backlog summary and the open tasks view, and publish them to Google Sheets and local files.
+
+    Parameters:
+        tasks_df (pd.DataFrame): Optional in-memory database sheet; read from Google Sheets if not given.
+
+    Returns:
+        tuple: (summary_df, open_tasks_df)
+    """
+    print("Step 9: Generating summary reports (teams, statuses, priorities, clients, SLA)")
+
+    if tasks_df is None:
+        tasks_df = read_google_sheet(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET)
+
+    summary_df = build_summary(tasks_df)
+    open_tasks_df = build_open_tasks_view(tasks_df)
+
+    write_summary_to_sheet(summary_df)
+    written_paths = write_reports_to_files(summary_df, open_tasks_df)
+
+    print(f"\tSummary with {len(summary_df)} rows written to the '{SPREADSHEET_KEY_ISSUES_SUMMARYSHEET}' sheet.")
+    print(f"\tOpen backend/frontend tasks in the filtered view: {len(open_tasks_df)}")
+    print(f"\tLocal reports written: {', '.join(written_paths)}")
+    return summary_df, open_tasks_df
+
+# Example usage
+if __name__ == "__main__":
+    generate_reports()
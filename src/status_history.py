@@ -0,0 +1,220 @@
+# src/status_history.py
+
+import os
+import glob
+from datetime import datetime, date
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.dataset as ds
+from config.settings import SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET, STATUS_HISTORY_DIR
+from src.google_sheets import read_google_sheet
+from src.status_rules import STATUS_RULES
+
+SNAPSHOT_COLUMNS = ["Ticket", "Status", "DevTeam", "Priority"]
+SNAPSHOT_FILE = "snapshot.parquet"
+
+def _partition_path(snapshot_date, history_dir=STATUS_HISTORY_DIR):
+    return os.path.join(history_dir, f"date={snapshot_date.isoformat()}", SNAPSHOT_FILE)
+
+def _to_date(value):
+    if value is None:
+        return None
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    return date.fromisoformat(value)
+
+def write_snapshot(tasks_df, snapshot_date=None, history_dir=STATUS_HISTORY_DIR):
+    """
+    Store the status of every ticket as the snapshot of a day (a rerun on the same day replaces it).
+
+    Parameters:
+        tasks_df (pd.DataFrame): The database (all-tasks) sheet.
+        snapshot_date (date): The day of the snapshot (today if None).
+        history_dir (str): Root of the date-partitioned snapshot store.
+
+    Returns:
+        str: The path of the written partition.
+    """
+    snapshot_date = _to_date(snapshot_date) or date.today()
+    snapshot_df = pd.DataFrame({
+        column: (tasks_df[column] if column in tasks_df.columns else pd.Series("", index=tasks_df.index)).fillna("").astype(str)
+        for column in SNAPSHOT_COLUMNS
+    })
+    snapshot_df = snapshot_df[snapshot_df["Ticket"] != ""].drop_duplicates(subset="Ticket", keep="first")
+    # Dictionary-encoded columns keep a year of daily 40k-ticket snapshots small and fast to scan
+    snapshot_df = snapshot_df.astype("category").reset_index(drop=True)
+
+    path = _partition_path(snapshot_date, history_dir)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    # Dot-prefixed, so dataset scans never pick up a half-written file
+    tmp_path = os.path.join(os.path.dirname(path), f".{SNAPSHOT_FILE}.tmp")
+    snapshot_df.to_parquet(tmp_path, index=False)
+    os.replace(tmp_path, path)
+    return path
+
+def list_snapshot_dates(history_dir=STATUS_HISTORY_DIR):
+    """
+    Return the dates of all stored snapshots, oldest first.
+    """
+    partitions = glob.glob(os.path.join(history_dir, "date=*", SNAPSHOT_FILE))
+    return sorted(date.fromisoformat(os.path.basename(os.path.dirname(path))[len("date="):]) for path in partitions)
+
+def load_snapshots(start=None, end=None, columns=("Ticket", "Status"), history_dir=STATUS_HISTORY_DIR):
+    """
+    Load the snapshots between start and end (inclusive) into one long table.
+
+    The partitions are scanned as one Parquet dataset, so the date filter and the
+    dictionary-encoded columns are handled by Arrow without per-file Python work.
+
+    Parameters:
+        start (date): First day to load (oldest snapshot if None).
+        end (date): Last day to load (latest snapshot if None).
+        columns (tuple): Snapshot columns to read besides the date.
+        history_dir (str): Root of the date-partitioned snapshot store.
+
+    Returns:
+        pd.DataFrame: 'Date' (datetime64) plus the requested columns as categoricals, sorted by Ticket then Date.
+    """
+    start, end = _to_date(start), _to_date(end)
+    if not list_snapshot_dates(history_dir):
+        return pd.DataFrame({"Date": pd.Series(dtype="datetime64[s]"), **{column: pd.Series(dtype="category") for column in columns}})
+
+    partitioning = ds.partitioning(pa.schema([("date", pa.date32())]), flavor="hive")
+    dataset = ds.dataset(history_dir, format="parquet", partitioning=partitioning)
+    date_filter = None
+    if start is not None:
+        date_filter = ds.field("date") >= pa.scalar(start, pa.date32())
+    if end is not None:
+        end_filter = ds.field("date") <= pa.scalar(end, pa.date32())
+        date_filter = end_filter if date_filter is None else date_filter & end_filter
+
+    table = dataset.to_table(columns=["date"] + list(columns), filter=date_filter).unify_dictionaries()
+    snapshots_df = table.to_pandas(date_as_object=False).rename(columns={"date": "Date"})
+    for column in columns:
+        snapshots_df[column] = snapshots_df[column].astype("category")
+
+    # Group each ticket's observations together, in date order
+    order = np.lexsort((snapshots_df["Date"].to_numpy(), snapshots_df["Ticket"].cat.codes.to_numpy()))
+    return snapshots_df.take(order).reset_index(drop=True)
+
+def _observation_days(snapshots_df, as_of):
+    # Each observation stands for the time until the next snapshot (or as_of for the latest one)
+    snapshot_days = np.unique(snapshots_df["Date"].to_numpy().astype("datetime64[D]"))
+    as_of_day = np.datetime64(_to_date(as_of) or date.today(), "D")
+    next_days = np.append(snapshot_days[1:], max(as_of_day, snapshot_days[-1]))
+    positions = np.searchsorted(snapshot_days, snapshots_df["Date"].to_numpy().astype("datetime64[D]"))
+    return (next_days[positions] - snapshot_days[positions]).astype(np.int64)
+
+def time_in_status(snapshots_df, as_of=None):
+    """
+    Days every ticket spent in each status.
+
+    Parameters:
+        snapshots_df (pd.DataFrame): Output of load_snapshots.
+        as_of (date): End of the last interval (today if None).
+
+    Returns:
+        pd.DataFrame: Ticket, Status, Days.
+    """
+    if snapshots_df.empty:
+        return pd.DataFrame(columns=["Ticket", "Status", "Days"])
+    days = pd.Series(_observation_days(snapshots_df, as_of), index=snapshots_df.index)
+    result = days.groupby([snapshots_df["Ticket"], snapshots_df["Status"]], observed=True).sum()
+    return result.rename("Days").reset_index()
+
+def average_time_in_status(snapshots_df, as_of=None):
+    """
+    Mean and median days tickets spent in each status (e.g. how long tickets sit in 'QA - Backend').
+    """
+    per_ticket_df = time_in_status(snapshots_df, as_of)
+    if per_ticket_df.empty:
+        return pd.DataFrame(columns=["Status", "Tickets", "MeanDays", "MedianDays"])
+    return per_ticket_df.groupby("Status", observed=True)["Days"].agg(Tickets="size", MeanDays="mean", MedianDays="median").reset_index()
+
+def cycle_time(snapshots_df, start_statuses=None, done_statuses=("Done",)):
+    """
+    Days from the first snapshot in a start status to the first later snapshot in a done status.
+
+    Parameters:
+        snapshots_df (pd.DataFrame): Output of load_snapshots.
+        start_statuses (list): Statuses that start the cycle (the active statuses except 'Backlog' if None).
+        done_statuses (list): Statuses that end the cycle.
+
+    Returns:
+        pd.DataFrame: Ticket, StartDate, DoneDate, CycleDays for tickets that completed a cycle.
+    """
+    if start_statuses is None:
+        start_statuses = [status for status in STATUS_RULES.active_statuses if status != "Backlog"]
+
+    is_start = snapshots_df["Status"].isin(start_statuses)
+    start_dates = snapshots_df["Date"][is_start].groupby(snapshots_df["Ticket"][is_start], observed=True).min().rename("StartDate")
+
+    is_done = snapshots_df["Status"].isin(done_statuses)
+    done_df = snapshots_df[is_done][["Ticket", "Date"]].join(start_dates, on="Ticket", how="inner")
+    done_df = done_df[done_df["Date"] > done_df["StartDate"]]
+    done_dates = done_df.groupby("Ticket", observed=True)["Date"].min().rename("DoneDate")
+
+    result = pd.concat([start_dates, done_dates], axis=1, join="inner").reset_index()
+    result["CycleDays"] = (result["DoneDate"] - result["StartDate"]).dt.days
+    return result
+
+def backlog_aging(snapshots_df, as_of=None, closed_statuses=None):
+    """
+    Age of the tickets still open in the latest snapshot.
+
+    Parameters:
+        snapshots_df (pd.DataFrame): Output of load_snapshots.
+        as_of (date): Day the ages are computed for (today if None).
+        closed_statuses (list): Statuses that are not backlog (the closed statuses of the rules if None).
+
+    Returns:
+        pd.DataFrame: Ticket, Status, FirstSeen, AgeDays, DaysInCurrentStatus, oldest first.
+    """
+    if closed_statuses is None:
+        closed_statuses = list(STATUS_RULES.closed_statuses)
+    columns = ["Ticket", "Status", "FirstSeen", "AgeDays", "DaysInCurrentStatus"]
+    if snapshots_df.empty:
+        return pd.DataFrame(columns=columns)
+    as_of_day = pd.Timestamp(_to_date(as_of) or date.today())
+
+    tickets = snapshots_df["Ticket"].cat.codes.to_numpy()
+    statuses = snapshots_df["Status"].cat.codes.to_numpy()
+    dates = snapshots_df["Date"].to_numpy()
+
+    # Rows are sorted by ticket then date: a new status run starts where the ticket or its status changes
+    run_starts = np.ones(len(snapshots_df), dtype=bool)
+    run_starts[1:] = (tickets[1:] != tickets[:-1]) | (statuses[1:] != statuses[:-1])
+    run_start_dates = pd.Series(np.where(run_starts, dates, np.datetime64("NaT")), index=snapshots_df.index).ffill()
+
+    is_last = np.ones(len(snapshots_df), dtype=bool)
+    is_last[:-1] = tickets[1:] != tickets[:-1]
+    latest_day = snapshots_df["Date"].max()
+    current = is_last & (dates == latest_day) & ~snapshots_df["Status"].isin(closed_statuses).to_numpy()
+
+    first_seen = snapshots_df.groupby("Ticket", observed=True)["Date"].transform("min")
+    result = snapshots_df.loc[current, ["Ticket", "Status"]].copy()
+    result["FirstSeen"] = first_seen[current]
+    result["AgeDays"] = (as_of_day - result["FirstSeen"]).dt.days
+    result["DaysInCurrentStatus"] = (as_of_day - run_start_dates[current]).dt.days
+    return result.sort_values(by="AgeDays", ascending=False)[columns].reset_index(drop=True)
+
+def record_status_snapshot(tasks_df=None):
+    """
+    Store today's status of every ticket in the database sheet in the history store.
+    """
+    print("Status history: Recording today's status snapshot")
+
+    if tasks_df is None:
+        tasks_df = read_google_sheet(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET)
+    path = write_snapshot(tasks_df)
+    print(f"\tStatus snapshot of {len(tasks_df)} tasks written to {path}")
+
+# Example usage
+if __name__ == "__main__":
+    history_df = load_snapshots()
+    print(average_time_in_status(history_df))
+    print(backlog_aging(history_df).head(25))
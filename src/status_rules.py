@@ -0,0 +1,105 @@
+# src/status_rules.py
+
+import os
+import json
+
+import pandas as pd
+from config.settings import STATUS_RULES_PATH
+
+# Default rules; any key can be overridden by the JSON file at STATUS_RULES_PATH
+DEFAULT_STATUS_RULES = {
+    # Step 2: a Jira status never overwrites these statuses in the database ...
+    "locked_statuses": ["Needs Product / Business Decision", "Out of Scope", "New UI", "Duplicate"],
+    # ... unless the new Jira status is one of these
+    "always_update_to": ["Done"],
+    # Step 5: plugin tasks with these statuses are not synced to Key Issues
+    "closed_statuses": ["Done", "Won't Do"],
+    # Step 6: plugin tasks with these statuses move to the PluginDone archive
+    "archive_statuses": ["Done", "Released"],
+    # Step 7: Backend/Frontend tasks reaching these statuses are removed from Key Issues
+    "removal_statuses": ["Beta", "PENDING TO DEPLOY", "Ready to Launch", "Waiting to Deploy",
+                         "UAT / Waiting Customer", "New UI Beta", "Won't Do", "Done"],
+    # Step 8: backend/frontend tasks that are still to do or in progress
+    "active_statuses": ["Backlog", "Todo - Backend", "In Dev - Backend", "Waiting PR - Backend", "QA - Backend",
+                        "Todo - Frontend", "In Dev - Frontend", "QA - Frontend", "To Do", "In Progress",
+                        "Requires Engineering assessment"],
+    # Jira priority -> database priority
+    "priority_mapping": {"Trivial": "1-Trivial", "Minor": "2-Minor", "Major": "3-Major",
+                         "Critical": "4-Critical", "Blocker": "5-Blocker"},
+    # Database priorities in ascending order of importance (sort order of step 8 and the reports)
+    "priority_order": ["1-Trivial", "2-Minor", "3-Major", "4-Critical", "5-Blocker"],
+    # Database priority -> SLA limit in days
+    "sla_limits": {"5-Blocker": 3, "4-Critical": 3, "3-Major": 10},
+    "default_sla_limit": 60
+}
+
+class StatusRules:
+    """
+    Status rules compiled into hash-backed lookups that are applied to whole columns with isin / map.
+    """
+
+    def __init__(self, rules):
+        self.rules = rules
+        self.locked_statuses = pd.Index(rules["locked_statuses"])
+        self.always_update_to = pd.Index(rules["always_update_to"])
+        self.closed_statuses = pd.Index(rules["closed_statuses"])
+        self.archive_statuses = pd.Index(rules["archive_statuses"])
+        self.removal_statuses = pd.Index(rules["removal_statuses"])
+        self.active_statuses = pd.Index(rules["active_statuses"])
+        self.priority_mapping = pd.Series(rules["priority_mapping"], dtype=object)
+        # Database priority -> rank in priority_order, so sorting by priority is sorting by rank
+        self.priority_ranks = pd.Series(range(len(rules["priority_order"])), index=rules["priority_order"], dtype="int64")
+        self.sla_limits = pd.Series(rules["sla_limits"], dtype="int64")
+        self.default_sla_limit = int(rules["default_sla_limit"])
+
+    def status_update_mask(self, old_statuses, new_statuses):
+        """
+        Vectorized should_update_status: True where the new status may overwrite the old one.
+        """
+        return pd.Series(new_statuses).isin(self.always_update_to).to_numpy() | ~pd.Series(old_statuses).isin(self.locked_statuses).to_numpy()
+
+    def transform_priorities(self, priorities):
+        """
+        Map Jira priorities to database priorities, leaving unknown values unchanged.
+        """
+        return priorities.map(self.priority_mapping).fillna(priorities)
+
+    def sla_limits_for(self, priorities):
+        """
+        SLA limit in days for each database priority.
+        """
+        return priorities.map(self.sla_limits).fillna(self.default_sla_limit).astype(int)
+
+    def priority_rank(self, priorities):
+        """
+        Rank of each database priority (higher is more important, -1 for unknown priorities).
+        """
+        return priorities.map(self.priority_ranks).fillna(-1).astype(int)
+
+def load_status_rules(path=STATUS_RULES_PATH):
+    """
+    Load the status rules, overriding the defaults with the JSON file at path if it exists.
+
+    Parameters:
+        path (str): Path of the JSON rules file.
+
+    Returns:
+        StatusRules: The compiled rules.
+    """
+    rules = dict(DEFAULT_STATUS_RULES)
+    if path and os.path.exists(path):
+        with open(path, "r") as f:
+            overrides = json.load(f)
+        unknown_keys = set(overrides) - set(DEFAULT_STATUS_RULES)
+        if unknown_keys:
+            raise ValueError(f"Unknown status rule keys in {path}: {', '.join(sorted(unknown_keys))}")
+        rules.update(overrides)
+
+    unranked = sorted(set(rules["priority_mapping"].values()) - set(rules["priority_order"]))
+    if unranked:
+        raise ValueError(f"Priorities missing from priority_order in {path}: {', '.join(unranked)}")
+    if len(set(rules["priority_order"])) != len(rules["priority_order"]):
+        raise ValueError(f"Duplicate priorities in priority_order in {path}")
+    return StatusRules(rules)
+
+STATUS_RULES = load_status_rules()
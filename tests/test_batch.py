@@ -0,0 +1,140 @@
+import json
+import threading
+import time
+import multiprocessing
+from concurrent.futures import Future
+
+import pytest
+
+import src.batch as batch
+import src.main as pipeline
+import src.google_sheets as google_sheets
+from config import settings
+
+def write_projects(tmp_path, projects):
+    path = tmp_path / "projects.json"
+    path.write_text(json.dumps(projects))
+    return str(path)
+
+def test_load_projects(tmp_path):
+    projects = [{"name": "yc"}, {"name": "mobile", "settings": {"JIRA_JQL": "project = MOB"}}]
+    assert batch.load_projects(write_projects(tmp_path, projects)) == projects
+
+@pytest.mark.parametrize("projects, message", [
+    ([{"name": "yc"}, {"settings": {}}], "needs a name"),
+    ([{"name": "yc"}, {"name": ""}], "needs a name"),
+    ([{"name": "yc"}, {"name": "mobile"}, {"name": "yc"}], "Duplicate project names .*: yc"),
+    ([{"name": "yc", "settings": {"SPREADSHEET_DATABSE_ID": "typo"}}], "Unknown settings for project yc: SPREADSHEET_DATABSE_ID"),
+])
+def test_load_projects_rejects_invalid_projects(tmp_path, projects, message):
+    with pytest.raises(ValueError, match=message):
+        batch.load_projects(write_projects(tmp_path, projects))
+
+def test_projects_never_share_local_state(monkeypatch, tmp_path):
+    for key in batch.PROJECT_STATE_DIRS:
+        monkeypatch.setattr(settings, key, str(tmp_path / "state" / key.lower()))
+    for key in batch.PROJECT_STATE_FILES:
+        # Both state files in the same directory, as in the default settings
+        monkeypatch.setattr(settings, key, str(tmp_path / "state" / key.lower()))
+
+    yc, mobile = batch.project_settings({"name": "yc"}), batch.project_settings({"name": "mobile"})
+    state_keys = batch.PROJECT_STATE_DIRS + batch.PROJECT_STATE_FILES
+    assert sorted(yc) == sorted(mobile) == sorted(state_keys)
+
+    paths = [project[key] for project in (yc, mobile) for key in state_keys]
+    assert len(set(paths)) == len(paths)
+    assert mobile["CHECKPOINT_DIR"] == str(tmp_path / "state" / "checkpoint_dir" / "mobile")
+    assert mobile["JIRA_LAST_RUN_PATH"] == str(tmp_path / "state" / "mobile" / "jira_last_run_path")
+
+def test_project_settings_keep_explicit_overrides(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "EMAIL_DRY_RUN_DIR", None)
+    overrides = batch.project_settings({"name": "yc", "settings": {"CHECKPOINT_DIR": "/data/yc-checkpoints", "JIRA_JQL": "project = YC"}})
+
+    assert overrides["CHECKPOINT_DIR"] == "/data/yc-checkpoints"
+    assert overrides["JIRA_JQL"] == "project = YC"
+    # Unset state stays unset
+    assert "EMAIL_DRY_RUN_DIR" not in overrides
+
+def test_rate_limiter_spaces_requests_across_callers():
+    with multiprocessing.Manager() as manager:
+        rate_limiter = batch.SharedRateLimiter(manager, requests_per_minute=600)
+        acquired = []
+
+        def acquire_twice():
+            for _ in range(2):
+                rate_limiter.acquire()
+                acquired.append(time.time())
+
+        callers = [threading.Thread(target=acquire_twice) for _ in range(3)]
+        for caller in callers:
+            caller.start()
+        for caller in callers:
+            caller.join()
+
+    acquired.sort()
+    gaps = [later - earlier for earlier, later in zip(acquired, acquired[1:])]
+    # 600 requests per minute: one slot every 0.1s, whoever asks
+    assert len(acquired) == 6
+    assert min(gaps) >= 0.09
+    assert acquired[-1] - acquired[0] >= 0.5 - 0.01
+
+class InlineExecutor:
+    # Runs the projects in the test process, so that their outcomes can be scripted
+    def __init__(self, *args, **kwargs):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        return False
+
+    def submit(self, fn, *args):
+        future = Future()
+        try:
+            future.set_result(fn(*args))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+def fake_run_project(project, rate_limiter, log_dir, fresh=False):
+    if project["name"] == "crashed":
+        raise RuntimeError("worker process died")
+    status = "failed" if project["name"] == "broken" else "succeeded"
+    return {"project": project["name"], "status": status, "started_at": None, "duration_seconds": 0.0,
+            "run_id": "run", "change_events": 0, "error": "ValueError: bad export" if status == "failed" else None, "log": None}
+
+def test_failed_projects_are_counted_in_the_report(monkeypatch, tmp_path):
+    monkeypatch.setattr(settings, "REPORT_OUTPUT_DIR", str(tmp_path / "reports"))
+    monkeypatch.setattr(batch, "ProcessPoolExecutor", InlineExecutor)
+    monkeypatch.setattr(batch, "run_project", fake_run_project)
+
+    projects = [{"name": "yc"}, {"name": "broken"}, {"name": "crashed"}, {"name": "mobile"}]
+    report = batch.run_batch(projects, workers=2)
+
+    report_path = tmp_path / "reports" / "batches" / f"batch-{report['batch_id']}.json"
+    assert json.loads(report_path.read_text()) == report
+    assert (report["succeeded"], report["failed"]) == (2, 2)
+    assert [result["project"] for result in report["projects"]] == ["yc", "broken", "crashed", "mobile"]
+    outcomes = {result["project"]: (result["status"], result["error"]) for result in report["projects"]}
+    assert outcomes["broken"] == ("failed", "ValueError: bad export")
+    assert outcomes["crashed"] == ("failed", "RuntimeError: worker process died")
+
+def test_failing_pipeline_is_reported_with_its_log(monkeypatch, tmp_path):
+    project = {"name": "yc", "settings": {"REPORT_OUTPUT_DIR": str(tmp_path / "reports")}}
+    # run_project applies the project settings globally: restore them after the test
+    for key in batch.project_settings(project):
+        monkeypatch.setattr(settings, key, getattr(settings, key))
+    monkeypatch.setattr(google_sheets, "_rate_limiter", None)
+
+    def failing_main(fresh=False):
+        print("Step 1: Reading the Jira export")
+        raise FileNotFoundError("jira_export.csv")
+
+    monkeypatch.setattr(pipeline, "main", failing_main)
+    result = batch.run_project(project, rate_limiter=None, log_dir=str(tmp_path))
+
+    assert result["status"] == "failed"
+    assert result["error"] == "FileNotFoundError: jira_export.csv"
+    with open(result["log"]) as log:
+        assert "Step 1: Reading the Jira export" in log.read()
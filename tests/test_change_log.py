@@ -0,0 +1,32 @@
+import pytest
+
+import src.change_log as change_log
+from src.google_sheets import SheetWrite, _notify_write
+
+@pytest.fixture
+def logged_events(monkeypatch):
+    events = []
+    monkeypatch.setattr(change_log, "_append_events", events.extend)
+    monkeypatch.setattr(change_log, "_pending_events", {})
+    return events
+
+def test_events_are_logged_when_their_sheet_is_written(logged_events):
+    with change_log.step("move_done_tasks_to_archive"):
+        change_log.emit_removals("key-issues", "Plugins(All)", ["YC-1"])
+        change_log.emit_inserts("db", "PluginDone", ["YC-1"])
+
+        _notify_write(SheetWrite("db", "PluginDone"))
+        assert [event["field"] for event in logged_events] == ["PluginDone.listed"]
+        assert logged_events[0]["step"] == "move_done_tasks_to_archive"
+
+def test_events_of_unwritten_sheets_are_dropped(logged_events):
+    with pytest.raises(RuntimeError):
+        with change_log.step("update_task_statuses"):
+            change_log.emit_changes("Status", ["YC-1"], ["To Do"], ["Done"], sheet=("db", "Main"))
+            raise RuntimeError("write failed")
+
+    # A rerun of the step writes the sheet: only its own events are logged
+    with change_log.step("update_task_statuses"):
+        change_log.emit_changes("Status", ["YC-1"], ["To Do"], ["Done"], sheet=("db", "Main"))
+        _notify_write(SheetWrite("db", "Main"))
+    assert len(logged_events) == 1
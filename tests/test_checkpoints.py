@@ -0,0 +1,83 @@
+import json
+import os
+from datetime import datetime, timedelta
+
+import pandas as pd
+import pytest
+
+import src.google_sheets as google_sheets
+from src.checkpoints import RunCheckpoint, MANIFEST_FILE, CHECKPOINT_MAX_AGE
+from tests.test_google_sheets import FakeSpreadsheet, FakeWorksheet
+
+@pytest.fixture
+def sheets(monkeypatch):
+    spreadsheet = FakeSpreadsheet()
+    worksheets = {("db", "Main"): FakeWorksheet([{"Ticket": "YC-1", "Status": "Live"}]),
+                  ("db", "PluginDone"): FakeWorksheet([{"Ticket": "YC-2"}])}
+    monkeypatch.setattr(google_sheets, "_spreadsheets", {"db": spreadsheet})
+    monkeypatch.setattr(google_sheets, "_worksheets", worksheets)
+    monkeypatch.setattr(google_sheets, "_sheet_cache", {})
+    monkeypatch.setattr(google_sheets, "_sheet_cache_ttl", None)
+    monkeypatch.setattr(google_sheets, "_preloaded_sheets", {})
+    return spreadsheet, worksheets
+
+def run_steps_then_fail(directory, spreadsheet):
+    # Step 1 writes Main, step 2 writes PluginDone of the same spreadsheet, step 3 fails
+    checkpoint = RunCheckpoint.start_or_resume(directory=directory)
+    with checkpoint.step("update_task_statuses"):
+        google_sheets.write_google_sheet("db", "Main", pd.DataFrame({"Ticket": ["YC-1"], "Status": ["Checkpointed"]}))
+    spreadsheet.modified_time = "2024-11-18T10:01:00.000Z"
+    with checkpoint.step("move_done_tasks_to_archive"):
+        google_sheets.write_google_sheet("db", "PluginDone", pd.DataFrame({"Ticket": ["YC-2", "YC-3"]}))
+    with pytest.raises(RuntimeError):
+        with checkpoint.step("generate_reports"):
+            raise RuntimeError("Sheets API unavailable")
+    return checkpoint
+
+def test_resume_skips_completed_steps_and_restores_their_sheets(sheets, tmp_path):
+    spreadsheet, worksheets = sheets
+    directory = str(tmp_path)
+    first = run_steps_then_fail(directory, spreadsheet)
+
+    resumed = RunCheckpoint.start_or_resume(directory=directory)
+    assert resumed.run_id == first.run_id
+    assert resumed.is_completed("update_task_statuses") and resumed.is_completed("move_done_tasks_to_archive")
+    assert not resumed.is_completed("generate_reports")
+
+    # Main was checkpointed before PluginDone changed the spreadsheet: it is still reused
+    assert google_sheets.read_google_sheet("db", "Main")["Status"].tolist() == ["Checkpointed"]
+    assert google_sheets.read_google_sheet("db", "PluginDone")["Ticket"].tolist() == ["YC-2", "YC-3"]
+    assert worksheets[("db", "Main")].reads == worksheets[("db", "PluginDone")].reads == 0
+
+def test_changed_spreadsheet_is_read_again(sheets, tmp_path):
+    spreadsheet, worksheets = sheets
+    run_steps_then_fail(str(tmp_path), spreadsheet)
+    # Someone edits the sheet before the rerun
+    spreadsheet.modified_time = "2024-11-18T10:30:00.000Z"
+
+    RunCheckpoint.start_or_resume(directory=str(tmp_path))
+    assert google_sheets.read_google_sheet("db", "Main")["Status"].tolist() == ["Live"]
+    assert worksheets[("db", "Main")].reads == 1
+
+def test_fresh_and_stale_runs_start_over(sheets, tmp_path):
+    spreadsheet, worksheets = sheets
+    directory = str(tmp_path)
+    run_steps_then_fail(directory, spreadsheet)
+    fresh = RunCheckpoint.start_or_resume(directory=directory, fresh=True)
+    assert fresh.manifest["steps"] == {}
+    assert google_sheets._preloaded_sheets == {}
+
+    run_steps_then_fail(directory, spreadsheet)
+    manifest_path = os.path.join(directory, MANIFEST_FILE)
+    with open(manifest_path) as f:
+        manifest = json.load(f)
+    manifest["started_at"] = (datetime.now() - CHECKPOINT_MAX_AGE - timedelta(minutes=1)).isoformat()
+    with open(manifest_path, "w") as f:
+        json.dump(manifest, f)
+    assert RunCheckpoint.start_or_resume(directory=directory).manifest["steps"] == {}
+
+def test_completed_run_is_not_resumed(sheets, tmp_path):
+    spreadsheet, worksheets = sheets
+    checkpoint = run_steps_then_fail(str(tmp_path), spreadsheet)
+    checkpoint.finish()
+    assert RunCheckpoint.start_or_resume(directory=str(tmp_path)).manifest["steps"] == {}
@@ -0,0 +1,91 @@
+import pandas as pd
+import pytest
+
+import src.change_log as change_log
+import src.fetch_jira as fetch_jira
+import src.data_processing as data_processing
+from src.data_processing import update_task_statuses, update_backend_frontend_status
+from config.settings import SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET, SPREADSHEET_KEY_ISSUES_ID, SPREADSHEET_KEY_ISSUES_MAINSHEET
+
+LOCKED_STATUSES = {"Needs Product / Business Decision", "Out of Scope", "New UI", "Duplicate"}
+REMOVAL_STATUSES = {"Beta", "PENDING TO DEPLOY", "Ready to Launch", "Waiting to Deploy", "UAT / Waiting Customer", "New UI Beta", "Won't Do", "Done"}
+
+@pytest.fixture
+def sheets(monkeypatch):
+    contents = {}
+    written = {}
+    monkeypatch.setattr(data_processing, "read_google_sheet", lambda spreadsheet_id, sheet_name: contents[(spreadsheet_id, sheet_name)].copy())
+    monkeypatch.setattr(data_processing, "write_google_sheet", lambda spreadsheet_id, sheet_name, df: written.__setitem__((spreadsheet_id, sheet_name), df))
+    monkeypatch.setattr(change_log, "_pending_events", {})
+    return contents, written
+
+def loop_update_task_statuses(jira_df, database_df):
+    # The per-row loop step 2 replaced
+    database_df = database_df.copy()
+    for _, jira_row in jira_df.iterrows():
+        ticket_id, new_status = jira_row["Issue key"], jira_row["Status"]
+        rows = database_df[database_df["Ticket"] == ticket_id]
+        if not rows.empty:
+            old_status = rows.iloc[0]["Status"]
+            if (new_status == "Done" or old_status not in LOCKED_STATUSES) and old_status != new_status:
+                database_df.loc[database_df["Ticket"] == ticket_id, "Status"] = new_status
+    return database_df
+
+def loop_update_backend_frontend_status(key_issues_df, all_tasks_df):
+    # The per-row loop step 7 replaced
+    key_issues_df = key_issues_df.copy()
+    for index, task in key_issues_df.iterrows():
+        rows = all_tasks_df[all_tasks_df["Ticket"] == task["Ticket"]]
+        if not rows.empty:
+            latest_status = rows.iloc[0]["Status"]
+            if task["Status"] != latest_status:
+                key_issues_df.loc[index, "Status"] = latest_status
+                if latest_status in REMOVAL_STATUSES:
+                    key_issues_df.drop(index, inplace=True)
+    return key_issues_df
+
+def test_step_2_matches_the_loop(sheets, monkeypatch):
+    contents, written = sheets
+    database_df = pd.DataFrame({
+        "Ticket": ["YC-1", "YC-2", "YC-3", "YC-4", "YC-5", "YC-6"],
+        "Status": ["To Do", "Out of Scope", "Out of Scope", "In Progress", "Backlog", "Duplicate"]
+    })
+    # YC-4 appears twice in the export: its last status wins; YC-5 and YC-6 are not in Jira
+    jira_df = pd.DataFrame({
+        "Issue key": ["YC-1", "YC-2", "YC-3", "YC-4", "YC-4", "YC-9"],
+        "Status": ["In Progress", "Done", "In Progress", "QA - Backend", "Done", "To Do"]
+    })
+    contents[(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET)] = database_df
+    monkeypatch.setattr(fetch_jira, "read_jira_data", lambda: jira_df.copy())
+
+    update_task_statuses()
+    result = written[(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET)]
+    expected = loop_update_task_statuses(jira_df, database_df)
+    assert result["TicketId"].tolist() == expected["Ticket"].tolist()
+    assert result["Status"].tolist() == expected["Status"].tolist() == ["In Progress", "Done", "Out of Scope", "Done", "Backlog", "Duplicate"]
+
+def test_step_2_without_jira_data(sheets, monkeypatch):
+    contents, written = sheets
+    monkeypatch.setattr(fetch_jira, "read_jira_data", lambda: pd.DataFrame())
+    update_task_statuses()
+    assert written == {}
+
+def test_step_7_matches_the_loop(sheets):
+    contents, written = sheets
+    key_issues_df = pd.DataFrame({
+        "Ticket": ["YC-1", "YC-2", "YC-3", "YC-4", "YC-5"],
+        "Status": ["To Do", "In Dev - Backend", "QA - Backend", "Done", "In Progress"]
+    })
+    # YC-3 appears twice in all-tasks: the first row counts; YC-5 is not in all-tasks
+    all_tasks_df = pd.DataFrame({
+        "Ticket": ["YC-1", "YC-2", "YC-3", "YC-3", "YC-4"],
+        "Status": ["In Dev - Backend", "Done", "QA - Backend", "Beta", "Done"]
+    })
+    contents[(SPREADSHEET_KEY_ISSUES_ID, SPREADSHEET_KEY_ISSUES_MAINSHEET)] = key_issues_df
+    contents[(SPREADSHEET_DATABASE_ID, SPREADSHEET_DATABASE_MAINSHEET)] = all_tasks_df
+
+    update_backend_frontend_status()
+    result = written[(SPREADSHEET_KEY_ISSUES_ID, SPREADSHEET_KEY_ISSUES_MAINSHEET)]
+    expected = loop_update_backend_frontend_status(key_issues_df, all_tasks_df)
+    assert result["TicketId"].tolist() == expected["Ticket"].tolist() == ["YC-1", "YC-3", "YC-4", "YC-5"]
+    assert result["Status"].tolist() == expected["Status"].tolist()
@@ -0,0 +1,48 @@
+import pandas as pd
+
+from src.duplicate_detection import MinHashLSHIndex, build_shingles, sync_index_with_database, assign_duplicate_ids
+
+def test_near_duplicate_is_found_and_unrelated_ticket_is_not():
+    index = MinHashLSHIndex()
+    index.add("YC-1", build_shingles("Player crashes when switching audio track on Android TV", "Globo"))
+    index.add("YC-2", build_shingles("Add billing export for monthly invoices", "RTL"))
+
+    matches = index.query(build_shingles("Player crashes when switching the audio track on Android TV", "Globo"))
+    assert [key for key, _ in matches] == ["YC-1"]
+    assert matches[0][1] >= 0.6
+
+    assert index.query(build_shingles("Subtitles are misaligned on iOS after seeking", "Vodafone")) == []
+
+def test_database_sync_and_new_task_use_the_same_signature():
+    database_df = pd.DataFrame({"Ticket": ["YC-1"], "Summary": ["Login button is hidden on small screens"], "Client": ["Globo"]})
+    synced = MinHashLSHIndex()
+    sync_index_with_database(synced, database_df)
+
+    direct = MinHashLSHIndex()
+    direct.add("YC-1", build_shingles("Login button is hidden on small screens", "Globo"))
+    assert (synced.signatures["YC-1"] == direct.signatures["YC-1"]).all()
+
+def test_tickets_without_shingles_are_not_synced_again():
+    database_df = pd.DataFrame({"Ticket": ["YC-1", "YC-2"], "Summary": ["Crash on start", ""], "Client": ["", ""]})
+    index = MinHashLSHIndex()
+    assert sync_index_with_database(index, database_df) == 1
+    assert "YC-2" in index
+    assert sync_index_with_database(index, database_df) == 0
+
+def test_assign_duplicate_ids(tmp_path):
+    index_path = str(tmp_path / "index.pkl")
+    database_df = pd.DataFrame({"Ticket": ["YC-1", "YC-2"],
+                                "Summary": ["Player crashes when switching audio track on Android TV", "Add billing export"],
+                                "Client": ["Globo", "RTL"]})
+    new_tasks_df = pd.DataFrame({"TicketId": ["YC-3", "YC-4", "YC-5"],
+                                 "Summary": ["Player crashes when switching the audio track on Android TV",
+                                             "Dark mode for the settings page", "Dark mode for settings page"],
+                                 "Client": ["Globo", "", ""],
+                                 "Labels": ["android", "ui", "web"]})
+
+    result = assign_duplicate_ids(new_tasks_df, database_df, index_path=index_path)
+    # YC-5 duplicates YC-4 from the same batch
+    assert result["DuplicateID"].tolist() == ["YC-1", "", "YC-4"]
+
+    index = MinHashLSHIndex.load(index_path)
+    assert {"YC-1", "YC-2", "YC-3", "YC-4", "YC-5"} <= set(index.known_keys())
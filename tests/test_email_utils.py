@@ -0,0 +1,100 @@
+import socket
+import smtplib
+
+import pytest
+from aiosmtpd.controller import Controller
+
+from utils.email_utils import SMTPConnectionPool, build_message, send_messages
+
+class RecordingHandler:
+    def __init__(self):
+        self.delivered = []
+        self.data_attempts = 0
+        # Replies to give to the next DATA commands instead of accepting the message
+        self.replies = []
+
+    async def handle_DATA(self, server, session, envelope):
+        self.data_attempts += 1
+        if self.replies:
+            return self.replies.pop(0)
+        self.delivered.append((session.peer, envelope.rcpt_tos))
+        return "250 Message accepted"
+
+def free_port():
+    with socket.socket() as probe:
+        probe.bind(("127.0.0.1", 0))
+        return probe.getsockname()[1]
+
+@pytest.fixture
+def smtp_server():
+    handler = RecordingHandler()
+    controller = Controller(handler, hostname="127.0.0.1", port=free_port())
+    controller.start()
+    yield controller, handler
+    controller.stop()
+
+class CountingPool(SMTPConnectionPool):
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.connect_attempts = 0
+
+    def _connect(self):
+        self.connect_attempts += 1
+        return super()._connect()
+
+def make_pool(controller, **kwargs):
+    return CountingPool(controller.hostname, controller.port, use_tls=False, retry_backoff=0, **kwargs)
+
+def make_message(number=1):
+    return build_message("bot@example.com", [f"user{number}@example.com"], f"Subject {number}", "Body")
+
+def test_messages_reuse_one_connection_per_worker(smtp_server):
+    controller, handler = smtp_server
+    pool = make_pool(controller)
+    sent_count, failures = send_messages(pool, [make_message(number) for number in range(8)], max_workers=2)
+    pool.close()
+
+    assert (sent_count, failures) == (8, [])
+    assert len(handler.delivered) == 8
+    assert len({peer for peer, _ in handler.delivered}) <= 2
+
+def test_dropped_connection_is_reopened(smtp_server):
+    controller, handler = smtp_server
+    pool = make_pool(controller)
+    pool.send(make_message(1))
+    # The server side went away while the connection sat in the pool
+    pool._local.connection.sock.shutdown(socket.SHUT_RDWR)
+    pool.send(make_message(2))
+    pool.close()
+
+    assert len(handler.delivered) == 2
+    assert pool.connect_attempts == 2
+
+def test_temporary_refusal_is_retried(smtp_server):
+    controller, handler = smtp_server
+    handler.replies = ["451 Try again later"]
+    pool = make_pool(controller)
+    pool.send(make_message())
+    pool.close()
+
+    assert handler.data_attempts == 2
+    assert len(handler.delivered) == 1
+    # The connection stays usable after a refusal
+    assert pool.connect_attempts == 1
+
+def test_permanent_refusal_is_not_retried(smtp_server):
+    controller, handler = smtp_server
+    handler.replies = ["554 Message rejected"]
+    pool = make_pool(controller)
+    with pytest.raises(smtplib.SMTPDataError):
+        pool.send(make_message())
+    pool.close()
+
+    assert handler.data_attempts == 1
+    assert handler.delivered == []
+
+def test_connection_failures_are_retried_then_raised():
+    pool = CountingPool("127.0.0.1", free_port(), use_tls=False, retry_backoff=0, max_retries=2)
+    with pytest.raises(OSError):
+        pool.send(make_message())
+    assert pool.connect_attempts == 3
@@ -0,0 +1,114 @@
+import json
+import threading
+from datetime import datetime, timezone
+from zoneinfo import ZoneInfo
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+
+import pytest
+
+import src.fetch_jira as fetch_jira
+from src.fetch_jira import build_jql, fetch_jira_issues, create_jira_session, load_last_run, save_last_run, SEARCH_PATH, MYSELF_PATH
+
+def make_issue(number):
+    return {
+        "key": f"YC-{number}",
+        "fields": {
+            "summary": f"Issue {number}",
+            "status": {"name": "Done" if number % 2 else "In Progress"},
+            "issuetype": {"name": "Bug"},
+            "priority": {"name": "Major"},
+            "created": "2024-11-18T15:15:00.000+0100",
+            "resolutiondate": "2024-11-20T09:00:00.000+0100" if number % 2 else None,
+            "labels": ["globo", "android"] if number == 1 else []
+        }
+    }
+
+@pytest.fixture
+def jira_server():
+    issues = [make_issue(number) for number in range(1, 251)]
+    requests_seen = []
+
+    class SearchHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            requests_seen.append((self.path, None))
+            payload = json.dumps({"accountId": "1", "timeZone": "Europe/Madrid"}).encode("utf-8")
+            self.send_response(200 if self.path == MYSELF_PATH else 404)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def do_POST(self):
+            body = json.loads(self.rfile.read(int(self.headers["Content-Length"])))
+            requests_seen.append((self.path, body))
+            if self.path != SEARCH_PATH:
+                self.send_response(404)
+                self.end_headers()
+                return
+            start = int(body.get("nextPageToken") or 0)
+            end = start + body["maxResults"]
+            page = {"issues": issues[start:end], "isLast": end >= len(issues)}
+            if end < len(issues):
+                page["nextPageToken"] = str(end)
+            payload = json.dumps(page).encode("utf-8")
+            self.send_response(200)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    server = ThreadingHTTPServer(("127.0.0.1", 0), SearchHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield f"http://127.0.0.1:{server.server_address[1]}", requests_seen
+    server.shutdown()
+
+def test_fetch_follows_page_tokens(jira_server):
+    base_url, requests_seen = jira_server
+    df = fetch_jira_issues(base_url=base_url, jql="project = YC", session=create_jira_session("e", "t"), page_size=100)
+
+    assert len(requests_seen) == 3
+    assert [body.get("nextPageToken") for _, body in requests_seen] == [None, "100", "200"]
+    assert len(df) == 250
+    assert df["Issue key"].tolist() == [f"YC-{number}" for number in range(1, 251)]
+    assert list(df.columns[:7]) == ["Issue key", "Issue Type", "Status", "Priority", "Summary", "Created", "Resolved"]
+
+    first, second = df.iloc[0], df.iloc[1]
+    assert (first["Labels"], first["Labels.1"]) == ("globo", "android")
+    assert first["Created"] == "2024-11-18 15:15:00"
+    assert first["Resolved"] == "2024-11-20 09:00:00"
+    assert second["Status"] == "In Progress"
+    assert second["Resolved"] != second["Resolved"]  # NaN, like an empty cell of the CSV export
+
+def test_fetch_since_restricts_the_jql_in_the_user_time_zone(jira_server):
+    base_url, requests_seen = jira_server
+    fetch_jira_issues(since=datetime(2024, 11, 18, 14, 15, tzinfo=timezone.utc), base_url=base_url, jql="project = YC",
+                      session=create_jira_session("e", "t"))
+    # 14:15 UTC is 15:15 in Madrid, minus the 15 minutes of overlap
+    assert requests_seen[0] == (MYSELF_PATH, None)
+    assert requests_seen[1][1]["jql"] == '(project = YC) AND updated >= "2024/11/18 15:00" ORDER BY key'
+
+def test_build_jql_orders_by_key_unless_ordered():
+    since = datetime(2024, 1, 2, 3, 19, tzinfo=timezone.utc)
+    assert build_jql("project = YC") == "project = YC ORDER BY key"
+    assert build_jql("project = YC order by created DESC") == "project = YC ORDER BY created DESC"
+    assert build_jql("project = YC ORDER BY rank", since=since) == '(project = YC) AND updated >= "2024/01/02 03:04" ORDER BY rank'
+    assert build_jql("", since=since, jira_timezone=ZoneInfo("America/New_York")) == 'updated >= "2024/01/01 22:04" ORDER BY key'
+
+def test_last_run_marker_round_trip(tmp_path, monkeypatch):
+    path = str(tmp_path / "last_run.json")
+    assert load_last_run(path) is None
+
+    started_at = datetime(2024, 11, 18, 14, 15, 30, tzinfo=ZoneInfo("Europe/Madrid"))
+    monkeypatch.setattr(fetch_jira, "_fetch_started_at", started_at)
+    save_last_run(path)
+    last_run = load_last_run(path)
+    assert last_run == started_at
+    assert last_run.utcoffset().total_seconds() == 0
+
+    # A marker from before the zone was recorded is read as the host's local time
+    with open(path, "w") as f:
+        json.dump({"last_run": "2024-11-18T14:15:30"}, f)
+    assert load_last_run(path) == datetime(2024, 11, 18, 14, 15, 30).astimezone(timezone.utc)
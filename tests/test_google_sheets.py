@@ -0,0 +1,109 @@
+import pandas as pd
+import pytest
+
+import src.google_sheets as google_sheets
+
+class FakeWorksheet:
+    def __init__(self, records):
+        self.records = records
+        self.reads = 0
+        self.requests = []
+
+    def get_all_records(self):
+        self.reads += 1
+        return [dict(record) for record in self.records]
+
+    def clear(self):
+        self.requests.append("clear")
+
+    def append_rows(self, rows, value_input_option=None):
+        self.requests.append(("append_rows", rows))
+
+    def update(self, values, value_input_option=None):
+        self.requests.append(("update", values))
+
+class FakeSpreadsheet:
+    def __init__(self):
+        self.modified_time = "2024-11-18T10:00:00.000Z"
+        self.modified_time_requests = 0
+
+    def get_lastUpdateTime(self):
+        self.modified_time_requests += 1
+        return self.modified_time
+
+@pytest.fixture
+def fake_sheet(monkeypatch):
+    spreadsheet = FakeSpreadsheet()
+    worksheet = FakeWorksheet([{"Ticket": "YC-1", "Comments": ""}])
+    monkeypatch.setattr(google_sheets, "_spreadsheets", {"db": spreadsheet})
+    monkeypatch.setattr(google_sheets, "_worksheets", {("db", "Main"): worksheet})
+    monkeypatch.setattr(google_sheets, "_sheet_cache", {})
+    monkeypatch.setattr(google_sheets, "_preloaded_sheets", {})
+    monkeypatch.setattr(google_sheets, "_sheet_cache_ttl", 900)
+    return spreadsheet, worksheet
+
+def test_cached_sheet_is_served_while_the_spreadsheet_is_unchanged(fake_sheet):
+    spreadsheet, worksheet = fake_sheet
+    google_sheets.read_google_sheet("db", "Main")
+    google_sheets.read_google_sheet("db", "Main")
+    assert worksheet.reads == 1
+
+def test_manual_edit_invalidates_the_cached_sheet(fake_sheet):
+    spreadsheet, worksheet = fake_sheet
+    google_sheets.write_google_sheet("db", "Main", pd.DataFrame({"Ticket": ["YC-1"], "Comments": [""]}))
+    assert google_sheets.read_google_sheet("db", "Main")["Comments"].tolist() == [""]
+    assert worksheet.reads == 0
+
+    # Someone adds a comment in the sheet between two runs
+    worksheet.records = [{"Ticket": "YC-1", "Comments": "waiting for the customer"}]
+    spreadsheet.modified_time = "2024-11-18T10:05:00.000Z"
+    assert google_sheets.read_google_sheet("db", "Main")["Comments"].tolist() == ["waiting for the customer"]
+    assert worksheet.reads == 1
+
+def test_preloaded_sheet_is_served_only_while_the_spreadsheet_is_unchanged(fake_sheet, monkeypatch):
+    spreadsheet, worksheet = fake_sheet
+    monkeypatch.setattr(google_sheets, "_sheet_cache_ttl", None)
+    checkpointed = pd.DataFrame({"Ticket": ["YC-1"], "Comments": ["from the checkpoint"]})
+
+    google_sheets.preload_sheet("db", "Main", checkpointed, spreadsheet.modified_time)
+    assert google_sheets.read_google_sheet("db", "Main")["Comments"].tolist() == ["from the checkpoint"]
+    assert worksheet.reads == 0
+
+    spreadsheet.modified_time = "2024-11-18T10:05:00.000Z"
+    assert google_sheets.read_google_sheet("db", "Main")["Comments"].tolist() == [""]
+    assert worksheet.reads == 1
+
+def test_preload_does_not_cache_other_sheets(fake_sheet, monkeypatch):
+    spreadsheet, worksheet = fake_sheet
+    monkeypatch.setattr(google_sheets, "_sheet_cache_ttl", None)
+    google_sheets.preload_sheet("db", "Other", pd.DataFrame({"Ticket": ["YC-2"]}), spreadsheet.modified_time)
+
+    google_sheets.read_google_sheet("db", "Main")
+    google_sheets.read_google_sheet("db", "Main")
+    assert worksheet.reads == 2
+    assert google_sheets._sheet_cache_ttl is None
+
+def test_sheet_is_written_in_a_single_request(fake_sheet):
+    spreadsheet, worksheet = fake_sheet
+    df = pd.DataFrame({"Ticket": ["YC-1", "YC-2", "YC-3"], "SLAOverdueDays": [1.0, float("nan"), float("inf")]})
+    google_sheets.write_google_sheet("db", "Main", df)
+
+    assert worksheet.requests == ["clear", ("append_rows", [["Ticket", "SLAOverdueDays"], ["YC-1", 1.0], ["YC-2", ""], ["YC-3", ""]])]
+
+def test_write_without_cache_or_checkpoint_skips_the_read_back(fake_sheet, monkeypatch):
+    spreadsheet, worksheet = fake_sheet
+    monkeypatch.setattr(google_sheets, "_sheet_cache_ttl", None)
+    written = []
+    monkeypatch.setattr(google_sheets, "_write_listeners", [lambda write: written.append(write.sheet_name)])
+    monkeypatch.setattr(google_sheets, "_displayed_values", lambda df: pytest.fail("frame copied"))
+
+    google_sheets.write_google_sheet("db", "Main", pd.DataFrame({"Ticket": ["YC-1"]}))
+    assert written == ["Main"]
+    assert spreadsheet.modified_time_requests == 0
+
+def test_rows_are_appended_in_a_single_request(fake_sheet):
+    spreadsheet, worksheet = fake_sheet
+    google_sheets.append_google_sheet_rows("db", "Main", pd.DataFrame({"Ticket": ["YC-2", "YC-3"], "Priority": [2, 3]}))
+    google_sheets.append_google_sheet_rows("db", "Main", pd.DataFrame({"Ticket": [], "Priority": []}))
+
+    assert worksheet.requests == [("append_rows", [["YC-2", 2], ["YC-3", 3]])]
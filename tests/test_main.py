@@ -0,0 +1,61 @@
+import pytest
+
+import src.main as pipeline
+from src import daemon
+from src.checkpoints import RunCheckpoint
+
+@pytest.fixture
+def recorded_steps(monkeypatch, tmp_path):
+    steps_run = []
+    start_or_resume = RunCheckpoint.start_or_resume.__func__
+    monkeypatch.setattr(RunCheckpoint, "start_or_resume",
+                        classmethod(lambda cls, fresh=False: start_or_resume(cls, directory=str(tmp_path / "checkpoints"), fresh=fresh)))
+    monkeypatch.setattr(pipeline, "load_step", lambda step_name: lambda: steps_run.append(step_name))
+    return steps_run
+
+def test_watch_cycle_sends_no_mail(recorded_steps):
+    metrics = daemon.PipelineMetrics()
+    daemon.run_once(pipeline.run_watch_cycle, metrics)
+    daemon.run_once(pipeline.run_watch_cycle, metrics)
+
+    assert metrics.health()["status"] == "ok"
+    assert "send_notifications" not in recorded_steps
+    assert recorded_steps == pipeline.WATCH_STEP_NAMES * 2
+
+def test_scheduled_run_sends_the_mails(recorded_steps):
+    pipeline.main()
+    assert recorded_steps == pipeline.STEP_NAMES
+
+def test_bare_command_runs_the_pipeline():
+    args = pipeline.parse_args([])
+    assert (args.command, args.steps, args.fresh) == ("run", None, False)
+
+def test_legacy_fresh_option_runs_the_pipeline():
+    args = pipeline.parse_args(["--fresh"])
+    assert (args.command, args.fresh) == ("run", True)
+
+def test_legacy_watch_option_maps_to_the_watch_command():
+    args = pipeline.parse_args(["--watch", "--poll-interval", "5"])
+    assert (args.command, args.poll_interval) == ("watch", 5)
+
+def test_help_is_not_mapped_to_a_command(capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        pipeline.parse_args(["-h"])
+    assert exit_info.value.code == 0
+    assert "{run,watch,batch,steps}" in capsys.readouterr().out
+
+def test_steps_are_parsed_in_the_given_order():
+    args = pipeline.parse_args(["run", "--steps", "update_task_statuses, send_notifications"])
+    assert args.steps == ["update_task_statuses", "send_notifications"]
+
+@pytest.mark.parametrize("argv", [["run", "--steps", "update_task_statuses", "--fresh"], ["--fresh", "--steps", "update_task_statuses"]])
+def test_steps_and_fresh_are_mutually_exclusive(argv, capsys):
+    with pytest.raises(SystemExit) as exit_info:
+        pipeline.parse_args(argv)
+    assert exit_info.value.code == 2
+    assert "not allowed with argument" in capsys.readouterr().err
+
+def test_unknown_step_is_rejected(capsys):
+    with pytest.raises(SystemExit):
+        pipeline.parse_args(["run", "--steps", "update_statuses"])
+    assert "unknown step(s): update_statuses" in capsys.readouterr().err
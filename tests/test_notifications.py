@@ -0,0 +1,33 @@
+import pandas as pd
+
+from utils.email_utils import DryRunSink
+from src.notifications import send_notifications
+
+def test_empty_task_table_sends_a_zero_summary():
+    tasks_df = pd.DataFrame(columns=["Ticket", "Client", "Type", "Priority", "Status", "Summary", "DevTeam",
+                                     "SLAOverdueDays", "DaysToComplete", "CreationDate", "SLADeadline"])
+    sink = DryRunSink()
+    sent_count, failures = send_notifications(tasks_df, sink)
+
+    assert failures == []
+    assert sent_count == len(sink.messages)
+    excom = [message for message in sink.messages if message["Subject"].startswith("[Backlog] Excom summary")]
+    assert len(excom) == 1
+    assert "0 tasks, 0 over SLA (0%)" in excom[0].get_content()
+
+def test_tasks_past_their_deadline_are_flagged():
+    tasks_df = pd.DataFrame({
+        "Ticket": ["YC-1", "YC-2"], "Client": ["Globo", "Globo"], "Type": ["Bug", "Bug"],
+        "Priority": ["5-Blocker", "3-Major"], "Status": ["In Progress", "In Progress"], "Summary": ["Crash", "Typo"],
+        "DevTeam": ["Backend", "Frontend"], "CreationDate": ["01-Nov-2024", "01-Nov-2024"],
+        # YC-1 is long past its deadline, though its SLAOverdueDays was never updated since it was added
+        "SLADeadline": ["02-Nov-2024", "31-Dec-2999"], "ResolvedDate": ["", ""],
+        "SLAOverdueDays": [0, 0], "DaysToComplete": ["N/A", "N/A"]
+    })
+    sink = DryRunSink()
+    send_notifications(tasks_df, sink)
+
+    subjects = [message["Subject"] for message in sink.messages]
+    assert any(subject.startswith("[Backlog] Globo - 2 open tasks (1 over SLA)") for subject in subjects)
+    excom = [message for message in sink.messages if message["Subject"].startswith("[Backlog] Excom summary")]
+    assert "2 tasks, 1 over SLA (50%)" in excom[0].get_content()
@@ -0,0 +1,71 @@
+import numpy as np
+import pandas as pd
+
+from src.report_generator import build_summary, build_open_tasks_view, compute_sla_overdue_days, SUMMARY_COLUMNS
+
+TODAY = pd.Timestamp("2024-11-20")
+
+def make_tasks():
+    return pd.DataFrame({
+        "Ticket": ["YC-1", "YC-2", "YC-3", "YC-4", "PRODREQ-5"],
+        "DevTeam": ["Backend", "Backend", "Frontend", "Plugin", "Backend"],
+        "Status": ["Done", "In Dev - Backend", "Todo - Frontend", "In Progress", "Backlog"],
+        "Priority": ["3-Major", "5-Blocker", "2-Minor", "4-Critical", "5-Blocker"],
+        "Client": ["Globo, RTL", "Globo", "", "RTL", "Globo"],
+        "SLADeadline": ["15-Nov-2024", "16-Nov-2024", "N/A", "18-Nov-2024", "10-Nov-2024"],
+        "ResolvedDate": ["10-Nov-2024", "", "", "", ""],
+        # Only filled in when a task is added: stale, and not what the breaches are computed from
+        "SLAOverdueDays": [0, 0, 0, 0, 0],
+        "DaysToComplete": [2, "", "", "", ""]
+    })
+
+def summary_row(summary_df, dimension, value):
+    rows = summary_df[(summary_df["Dimension"] == dimension) & (summary_df["Value"] == value)]
+    assert len(rows) == 1
+    return rows.iloc[0]
+
+def test_summary_counts_multi_client_tasks_once_per_client():
+    summary_df = build_summary(make_tasks(), today=TODAY)
+
+    assert list(summary_df.columns) == SUMMARY_COLUMNS
+    assert summary_row(summary_df, "Total", "All tasks")["Tasks"] == 5
+    assert summary_row(summary_df, "Client", "Globo")["Tasks"] == 3
+    assert summary_row(summary_df, "Client", "RTL")["Tasks"] == 2
+    assert summary_row(summary_df, "Client", "(none)")["Tasks"] == 1
+    assert summary_row(summary_df, "DevTeam / Status", "Backend / Done")["Tasks"] == 1
+
+def test_summary_sla_and_percentile_columns():
+    tasks_df = make_tasks()
+    tasks_df["DaysToComplete"] = [2, 4, 6, 8, ""]
+    summary_df = build_summary(tasks_df, today=TODAY)
+
+    total = summary_row(summary_df, "Total", "All tasks")
+    assert total["SLABreached"] == 3
+    assert total["SLABreachRate"] == 0.6
+    assert total["ResolvedTasks"] == 4
+    assert (total["DaysToCompleteP50"], total["DaysToCompleteP75"], total["DaysToCompleteP90"]) == (5.0, 6.5, 7.4)
+
+    plugin = summary_row(summary_df, "DevTeam", "Plugin")
+    assert plugin["DaysToCompleteP50"] == 8.0
+    backend_unresolved = summary_row(summary_df, "DevTeam / Status", "Backend / Backlog")
+    assert backend_unresolved["ResolvedTasks"] == 0
+    assert np.isnan(backend_unresolved["DaysToCompleteP90"])
+
+def test_sla_overdue_days_from_the_deadline():
+    tasks_df = make_tasks()
+    # Resolved two days late, resolved in time, open past the deadline, no deadline, open within the deadline
+    tasks_df["SLADeadline"] = ["08-Nov-2024", "15-Nov-2024", "16-Nov-2024", "N/A", "25-Nov-2024"]
+    tasks_df["ResolvedDate"] = ["10-Nov-2024", "12-Nov-2024", "", "", ""]
+    assert compute_sla_overdue_days(tasks_df, today=TODAY).tolist() == [2, 0, 4, 0, 0]
+
+def test_empty_task_table():
+    empty_df = make_tasks().iloc[0:0]
+    summary_df = build_summary(empty_df)
+    assert summary_df.empty
+    assert list(summary_df.columns) == SUMMARY_COLUMNS
+    assert build_open_tasks_view(empty_df).empty
+
+def test_open_tasks_view_filters_and_sorts():
+    open_tasks_df = build_open_tasks_view(make_tasks(), today=TODAY)
+    # Done, Plugin and PRODREQ- tasks are left out; Blocker before Minor
+    assert open_tasks_df["Ticket"].tolist() == ["YC-2", "YC-3"]
@@ -0,0 +1,84 @@
+from datetime import date
+
+import pandas as pd
+import pytest
+
+from src.status_history import backlog_aging, cycle_time, list_snapshot_dates, load_snapshots, time_in_status, write_snapshot
+
+AS_OF = date(2024, 11, 10)
+
+SNAPSHOTS = {
+    date(2024, 11, 1): {"YC-1": "To Do", "YC-2": "In Progress", "YC-5": "Backlog"},
+    date(2024, 11, 3): {"YC-1": "In Progress", "YC-2": "Done"},
+    # YC-2 is reopened, YC-4 only appears in the latest snapshot
+    date(2024, 11, 6): {"YC-1": "Done", "YC-2": "In Progress", "YC-4": "To Do"},
+}
+
+@pytest.fixture
+def history_dir(tmp_path):
+    for snapshot_date, statuses in SNAPSHOTS.items():
+        tasks_df = pd.DataFrame({"Ticket": list(statuses), "Status": list(statuses.values())})
+        write_snapshot(tasks_df, snapshot_date, history_dir=str(tmp_path))
+    return str(tmp_path)
+
+def by_ticket(df, columns):
+    return {row["Ticket"]: tuple(row[column] for column in columns) for _, row in df.iterrows()}
+
+def test_snapshots_are_read_across_day_partitions(history_dir):
+    assert list_snapshot_dates(history_dir) == list(SNAPSHOTS)
+
+    snapshots_df = load_snapshots(history_dir=history_dir)
+    assert len(snapshots_df) == sum(len(statuses) for statuses in SNAPSHOTS.values())
+    for ticket, ticket_df in snapshots_df.groupby("Ticket", observed=True, sort=False):
+        assert ticket_df["Date"].is_monotonic_increasing
+        # Each ticket's observations are contiguous
+        assert ticket_df.index.to_series().diff().dropna().eq(1).all()
+
+    window_df = load_snapshots(start=date(2024, 11, 3), end="2024-11-06", history_dir=history_dir)
+    assert sorted(window_df["Date"].dt.date.unique()) == [date(2024, 11, 3), date(2024, 11, 6)]
+    assert "YC-5" not in set(window_df["Ticket"])
+
+def test_rerun_on_the_same_day_replaces_the_snapshot(history_dir):
+    write_snapshot(pd.DataFrame({"Ticket": ["YC-1"], "Status": ["Won't Do"]}), date(2024, 11, 6), history_dir=history_dir)
+
+    latest_df = load_snapshots(start=date(2024, 11, 6), history_dir=history_dir)
+    assert latest_df["Ticket"].tolist() == ["YC-1"]
+    assert latest_df["Status"].tolist() == ["Won't Do"]
+
+def test_time_in_status_follows_status_changes(history_dir):
+    result = time_in_status(load_snapshots(history_dir=history_dir), as_of=AS_OF)
+    days = {(row["Ticket"], row["Status"]): row["Days"] for _, row in result.iterrows()}
+
+    assert days == {
+        ("YC-1", "To Do"): 2, ("YC-1", "In Progress"): 3, ("YC-1", "Done"): 4,
+        # Both In Progress spells of the reopened ticket add up
+        ("YC-2", "In Progress"): 2 + 4, ("YC-2", "Done"): 3,
+        # Single-snapshot tickets: until the next snapshot, or as_of for the latest one
+        ("YC-4", "To Do"): 4, ("YC-5", "Backlog"): 2,
+    }
+
+def test_cycle_time_ends_at_the_first_done(history_dir):
+    result = cycle_time(load_snapshots(history_dir=history_dir))
+
+    assert by_ticket(result, ["StartDate", "DoneDate", "CycleDays"]) == {
+        "YC-1": (pd.Timestamp("2024-11-01"), pd.Timestamp("2024-11-06"), 5),
+        # Reopening after Done does not start a second cycle
+        "YC-2": (pd.Timestamp("2024-11-01"), pd.Timestamp("2024-11-03"), 2),
+    }
+
+def test_backlog_aging_counts_the_current_status_from_the_reopening(history_dir):
+    result = backlog_aging(load_snapshots(history_dir=history_dir), as_of=AS_OF)
+
+    # Closed and vanished tickets are not backlog; oldest first
+    assert result["Ticket"].tolist() == ["YC-2", "YC-4"]
+    assert by_ticket(result, ["Status", "FirstSeen", "AgeDays", "DaysInCurrentStatus"]) == {
+        "YC-2": ("In Progress", pd.Timestamp("2024-11-01"), 9, 4),
+        "YC-4": ("To Do", pd.Timestamp("2024-11-06"), 4, 4),
+    }
+
+def test_empty_history(tmp_path):
+    snapshots_df = load_snapshots(history_dir=str(tmp_path))
+
+    assert snapshots_df.empty
+    assert time_in_status(snapshots_df).empty
+    assert backlog_aging(snapshots_df).empty
@@ -0,0 +1,47 @@
+import json
+
+import pandas as pd
+import pytest
+
+from src.status_rules import load_status_rules, DEFAULT_STATUS_RULES
+
+def write_rules(tmp_path, overrides):
+    path = tmp_path / "status_rules.json"
+    path.write_text(json.dumps(overrides))
+    return str(path)
+
+def test_json_file_overrides_only_its_keys(tmp_path):
+    rules = load_status_rules(write_rules(tmp_path, {"closed_statuses": ["Done", "Won't Do", "Cancelled"]}))
+    assert list(rules.closed_statuses) == ["Done", "Won't Do", "Cancelled"]
+    assert list(rules.archive_statuses) == DEFAULT_STATUS_RULES["archive_statuses"]
+    assert list(load_status_rules(str(tmp_path / "missing.json")).closed_statuses) == DEFAULT_STATUS_RULES["closed_statuses"]
+
+@pytest.mark.parametrize("overrides, message", [
+    ({"closed_status": ["Done"]}, "Unknown status rule keys"),
+    ({"priority_mapping": {"Highest": "6-Highest"}}, "missing from priority_order"),
+    ({"priority_order": ["1-Trivial", "2-Minor", "3-Major", "4-Critical", "5-Blocker", "3-Major"]}, "Duplicate priorities"),
+])
+def test_invalid_rules_are_rejected(tmp_path, overrides, message):
+    with pytest.raises(ValueError, match=message):
+        load_status_rules(write_rules(tmp_path, overrides))
+
+def should_update_status(old_status, new_status):
+    # The per-row rule the mask replaced
+    if new_status == "Done":
+        return True
+    return old_status not in {"Needs Product / Business Decision", "Out of Scope", "New UI", "Duplicate"}
+
+def test_status_update_mask_matches_the_row_rule():
+    rules = load_status_rules(None)
+    statuses = ["Done", "In Progress", "Out of Scope", "Duplicate", "Backlog"]
+    pairs = [(old, new) for old in statuses for new in statuses]
+    mask = rules.status_update_mask(pd.Series([old for old, _ in pairs]), pd.Series([new for _, new in pairs]))
+    assert mask.tolist() == [should_update_status(old, new) for old, new in pairs]
+
+def test_priority_rank_and_sla_limits():
+    rules = load_status_rules(None)
+    priorities = pd.Series(["5-Blocker", "1-Trivial", "Highest", ""], index=[10, 11, 12, 13])
+    assert rules.priority_rank(priorities).tolist() == [4, 0, -1, -1]
+    assert list(rules.priority_rank(priorities).index) == [10, 11, 12, 13]
+    assert rules.sla_limits_for(pd.Series(["5-Blocker", "3-Major", "2-Minor", "Highest"])).tolist() == [3, 10, 60, 60]
+    assert rules.transform_priorities(pd.Series(["Blocker", "Highest"])).tolist() == ["5-Blocker", "Highest"]
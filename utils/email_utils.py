@@ -0,0 +1,201 @@
+# utils/email_utils.py
+
+import os
+import time
+import smtplib
+import threading
+from string import Template
+from email.message import EmailMessage
+from concurrent.futures import ThreadPoolExecutor
+
+def compile_templates(templates):
+    """
+    Compile a {name: text} mapping of templates once, so rendering per recipient is only a substitution.
+
+    Parameters:
+        templates (dict): Template name -> template text using $placeholders.
+
+    Returns:
+        dict: Template name -> string.Template.
+    """
+    return {name: Template(text) for name, text in templates.items()}
+
+def render_task_lines(tasks_df, columns):
+    """
+    Render tasks as aligned plain-text lines, one task per line.
+
+    Parameters:
+        tasks_df (pd.DataFrame): The tasks to render.
+        columns (list): The columns to include, in order.
+
+    Returns:
+        str: The rendered table (header + rows).
+    """
+    if tasks_df.empty:
+        return "(no tasks)"
+    values_df = tasks_df[columns].fillna("").astype(str)
+    widths = [max(len(column), values_df[column].str.len().max()) for column in columns]
+    header = "  ".join(column.ljust(width) for column, width in zip(columns, widths))
+    rows = ["  ".join(value.ljust(width) for value, width in zip(row, widths)) for row in values_df.itertuples(index=False)]
+    return "\n".join([header, "-" * len(header)] + rows)
+
+def build_message(sender, recipients, subject, body):
+    """
+    Build a plain-text email message.
+    """
+    message = EmailMessage()
+    message["From"] = sender
+    message["To"] = ", ".join(recipients)
+    message["Subject"] = subject
+    message.set_content(body)
+    return message
+
+def _is_transient(error):
+    # 4xx replies are temporary refusals; other errors reaching here are network failures before anything was sent
+    if isinstance(error, smtplib.SMTPResponseException):
+        return 400 <= error.smtp_code < 500
+    return isinstance(error, (smtplib.SMTPServerDisconnected, OSError))
+
+class SMTPConnectionPool:
+    """
+    Send messages over persistent SMTP connections, one per worker thread.
+
+    Connections are opened lazily, reused for every message the thread sends,
+    and reopened transparently if the server dropped them.
+    """
+
+    def __init__(self, host, port=587, username=None, password=None, use_tls=True, timeout=30, max_retries=3, retry_backoff=1.0):
+        self.host = host
+        self.port = port
+        self.username = username
+        self.password = password
+        self.use_tls = use_tls
+        self.timeout = timeout
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self._local = threading.local()
+        self._connections = []
+        self._lock = threading.Lock()
+
+    def _connect(self):
+        connection = smtplib.SMTP(self.host, self.port, timeout=self.timeout)
+        if self.use_tls:
+            connection.starttls()
+        if self.username:
+            connection.login(self.username, self.password)
+        with self._lock:
+            self._connections.append(connection)
+        return connection
+
+    def _connection(self):
+        connection = getattr(self._local, "connection", None)
+        if connection is not None:
+            # A pooled connection may have been dropped by the server while idle; find out before sending
+            try:
+                if connection.noop()[0] == 250:
+                    return connection
+            except (smtplib.SMTPException, OSError):
+                pass
+            self._discard_connection()
+        connection = self._local.connection = self._connect()
+        return connection
+
+    def _discard_connection(self):
+        connection = getattr(self._local, "connection", None)
+        self._local.connection = None
+        if connection is not None:
+            with self._lock:
+                if connection in self._connections:
+                    self._connections.remove(connection)
+            try:
+                connection.close()
+            except (smtplib.SMTPException, OSError):
+                pass
+
+    def send(self, message):
+        """
+        Send a message, retrying with exponential backoff only when the server cannot have taken it:
+        failures to (re)connect and temporary (4xx) refusals. Permanent (5xx) refusals are raised at
+        once, and so is a connection lost mid-transaction, since the message may already have been
+        accepted and a retry could deliver it twice.
+        """
+        for attempt in range(self.max_retries + 1):
+            try:
+                connection = self._connection()
+            except (smtplib.SMTPException, OSError) as e:
+                self._discard_connection()
+                if attempt == self.max_retries or not _is_transient(e):
+                    raise
+                time.sleep(self.retry_backoff * (2 ** attempt))
+                continue
+
+            try:
+                connection.send_message(message)
+                return
+            except smtplib.SMTPResponseException as e:
+                if attempt == self.max_retries or not _is_transient(e):
+                    raise
+            except (smtplib.SMTPException, OSError):
+                self._discard_connection()
+                raise
+            time.sleep(self.retry_backoff * (2 ** attempt))
+
+    def close(self):
+        """
+        Close every pooled connection.
+        """
+        with self._lock:
+            connections, self._connections = self._connections, []
+        for connection in connections:
+            try:
+                connection.quit()
+            except (smtplib.SMTPException, OSError):
+                pass
+
+class DryRunSink:
+    """
+    Stand-in for SMTPConnectionPool that keeps messages instead of sending them,
+    optionally writing each one to an .eml file for review.
+    """
+
+    def __init__(self, output_dir=None):
+        self.output_dir = output_dir
+        self.messages = []
+        self._lock = threading.Lock()
+
+    def send(self, message):
+        with self._lock:
+            self.messages.append(message)
+            position = len(self.messages)
+        if self.output_dir:
+            os.makedirs(self.output_dir, exist_ok=True)
+            with open(os.path.join(self.output_dir, f"{position:04d}.eml"), "wb") as f:
+                f.write(bytes(message))
+
+    def close(self):
+        pass
+
+def send_messages(transport, messages, max_workers=4):
+    """
+    Send messages concurrently through a transport (SMTPConnectionPool or DryRunSink).
+
+    Parameters:
+        transport: Object with a send(message) method.
+        messages (list): EmailMessage objects to send.
+        max_workers (int): Number of concurrent sender threads (and so pooled connections).
+
+    Returns:
+        tuple: (sent_count, failures) where failures is a list of (message, exception).
+    """
+    def send_one(message):
+        try:
+            transport.send(message)
+            return None
+        except Exception as e:
+            return (message, e)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        results = list(executor.map(send_one, messages))
+
+    failures = [result for result in results if result is not None]
+    return len(messages) - len(failures), failures